@@ -0,0 +1,448 @@
+"""Append-only archive of fetched pages, so extraction can be re-run offline.
+
+An archive is a directory containing:
+
+- ``manifest.json`` -- format version and compression codec.
+- ``segment-NNNNN.dat`` -- append-only chunks; every record is an
+  independently compressed frame (zstd when the optional ``zstandard`` package
+  is installed, gzip otherwise). A new segment is started once the current one
+  exceeds ``segment_size`` bytes.
+- ``index.jsonl`` -- one line per record with its URL, segment, byte offset and
+  frame length, giving random access without decompressing anything else.
+
+Attach a writer to a scraper's session (or any ``requests.Session``) to
+archive every response it receives, then re-parse the archive in parallel
+across cores with the current selectors:
+
+    writer = ArchiveWriter("pages/")
+    writer.attach(RemoteOKScraper().session)
+    ...
+    python -m res_match_crawler.archive reextract pages/ -o descriptions.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.parse as _urlparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from res_match_crawler.logging_setup import configure_logging
+from res_match_crawler.scrapers import IndeedScraper, RemoteOKScraper
+
+try:  # Optional dependency: better ratio and much faster decompression
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+INDEX_NAME = "index.jsonl"
+DEFAULT_SEGMENT_SIZE = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """Location of one archived response inside the archive directory."""
+
+    url: str
+    segment: int
+    offset: int
+    length: int
+    status: int
+    fetched_at: float
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    """A decoded archive record."""
+
+    url: str
+    status: int
+    headers: Dict[str, str]
+    fetched_at: float
+    body: bytes
+
+    @property
+    def text(self) -> str:
+        """Body decoded with the charset from Content-Type (UTF-8 fallback)."""
+        content_type = CaseInsensitiveDict(self.headers).get("Content-Type", "")
+        charset = "utf-8"
+        for part in content_type.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name.lower() == "charset" and value:
+                charset = value.strip("\"'")
+        try:
+            return self.body.decode(charset, errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+
+def _compressor(codec: str) -> Callable[[bytes], bytes]:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archive uses zstd but the 'zstandard' package is not installed")
+        return zstandard.ZstdCompressor(level=3).compress
+    if codec == "gzip":
+        return lambda data: gzip.compress(data, compresslevel=6)
+    raise ValueError(f"Unsupported archive codec {codec!r}")
+
+
+def _decompressor(codec: str) -> Callable[[bytes], bytes]:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archive uses zstd but the 'zstandard' package is not installed")
+        return zstandard.ZstdDecompressor().decompress
+    if codec == "gzip":
+        return gzip.decompress
+    raise ValueError(f"Unsupported archive codec {codec!r}")
+
+
+def _segment_path(root: str, segment: int) -> str:
+    return os.path.join(root, f"segment-{segment:05d}.dat")
+
+
+def _read_manifest(root: str) -> Dict[str, Any]:
+    with open(os.path.join(root, MANIFEST_NAME), "r", encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported archive version {manifest.get('version')!r}")
+    return manifest
+
+
+class ArchiveWriter:
+    """Append responses to an archive directory (thread-safe).
+
+    Parameters
+    ----------
+    root : str
+        Archive directory; created if missing, appended to if it exists.
+    codec : {"zstd", "gzip"}, optional
+        Compression for new archives. Defaults to zstd when available.
+    segment_size : int
+        Roll over to a new segment file once the current one exceeds this size.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        *,
+        codec: Optional[str] = None,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+    ) -> None:
+        self.root = root
+        self.segment_size = segment_size
+        os.makedirs(root, exist_ok=True)
+
+        manifest_path = os.path.join(root, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            self.codec = _read_manifest(root)["codec"]
+            if codec and codec != self.codec:
+                raise ValueError(f"Archive {root} already uses codec {self.codec!r}")
+        else:
+            self.codec = codec or ("zstd" if zstandard is not None else "gzip")
+            with open(manifest_path, "w", encoding="utf-8") as fh:
+                json.dump({"version": FORMAT_VERSION, "codec": self.codec}, fh)
+
+        self._compress = _compressor(self.codec)
+        self._lock = threading.Lock()
+        self._sessions: List[requests.Session] = []
+        self._segment = 0
+        while os.path.exists(_segment_path(root, self._segment + 1)):
+            self._segment += 1
+        self._data = open(_segment_path(root, self._segment), "ab")
+        self._index = open(os.path.join(root, INDEX_NAME), "a", encoding="utf-8")
+
+    def append(
+        self,
+        url: str,
+        body: bytes,
+        *,
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        fetched_at: Optional[float] = None,
+    ) -> ArchiveEntry:
+        """Compress and append one response, returning its index entry."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        header = json.dumps(
+            {
+                "url": url,
+                "status": status,
+                "headers": dict(headers or {}),
+                "fetched_at": fetched_at,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        frame = self._compress(header + b"\n" + body)
+
+        with self._lock:
+            if self._data.tell() and self._data.tell() + len(frame) > self.segment_size:
+                self._data.close()
+                self._segment += 1
+                self._data = open(_segment_path(self.root, self._segment), "ab")
+
+            entry = ArchiveEntry(
+                url=url,
+                segment=self._segment,
+                offset=self._data.tell(),
+                length=len(frame),
+                status=status,
+                fetched_at=fetched_at,
+            )
+            self._data.write(frame)
+            self._data.flush()
+            # Index after data so an entry never points at a partial frame
+            self._index.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            self._index.flush()
+        return entry
+
+    def record_response(self, response: requests.Response, *args: Any, **kwargs: Any) -> None:
+        """``requests`` response hook archiving *response*."""
+        try:
+            self.append(
+                response.url,
+                response.content,
+                status=response.status_code,
+                headers=dict(response.headers),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to archive %s: %s", response.url, exc)
+
+    def attach(self, session: requests.Session) -> None:
+        """Archive every response received by *session* (attaching twice is a no-op)."""
+        hooks = session.hooks.setdefault("response", [])
+        if self.record_response in hooks:
+            return
+        hooks.append(self.record_response)
+        self._sessions.append(session)
+
+    def close(self) -> None:
+        """Detach from all sessions, then flush and close the underlying files."""
+        for session in self._sessions:
+            hooks = session.hooks.get("response", [])
+            if self.record_response in hooks:
+                hooks.remove(self.record_response)
+        self._sessions.clear()
+        with self._lock:
+            self._data.close()
+            self._index.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ArchiveReader:
+    """Random-access reader over an archive directory."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.codec = _read_manifest(root)["codec"]
+        self._decompress = _decompressor(self.codec)
+
+    def entries(self) -> Iterator[ArchiveEntry]:
+        """Yield index entries in append order."""
+        with open(os.path.join(self.root, INDEX_NAME), "r", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield ArchiveEntry(**json.loads(line))
+
+    def latest(self) -> Dict[str, ArchiveEntry]:
+        """Return the most recent entry for every archived URL."""
+        return {entry.url: entry for entry in self.entries()}
+
+    def read(self, entry: ArchiveEntry) -> ArchivedPage:
+        """Read and decode the record referenced by *entry*."""
+        with open(_segment_path(self.root, entry.segment), "rb") as fh:
+            return self._read_from(fh, entry)
+
+    def read_many(self, entries: Iterable[ArchiveEntry]) -> Iterator[ArchivedPage]:
+        """Read several records, reusing open segment files."""
+        handles: Dict[int, Any] = {}
+        try:
+            for entry in entries:
+                if entry.segment not in handles:
+                    handles[entry.segment] = open(_segment_path(self.root, entry.segment), "rb")
+                yield self._read_from(handles[entry.segment], entry)
+        finally:
+            for fh in handles.values():
+                fh.close()
+
+    def _read_from(self, fh: Any, entry: ArchiveEntry) -> ArchivedPage:
+        fh.seek(entry.offset)
+        raw = self._decompress(fh.read(entry.length))
+        header, _, body = raw.partition(b"\n")
+        meta = json.loads(header)
+        return ArchivedPage(
+            url=meta["url"],
+            status=meta["status"],
+            headers=meta["headers"],
+            fetched_at=meta["fetched_at"],
+            body=body,
+        )
+
+
+# ----------------------------------------------------------------------
+# Re-extraction
+# ----------------------------------------------------------------------
+Extractor = Callable[[str], str]
+
+
+def extractor_for(url: str) -> Optional[Extractor]:
+    """Return the description extractor for a detail-page *url*, if any."""
+    parsed = _urlparse.urlparse(url)
+    host = parsed.netloc.lower()
+    if host.endswith("remoteok.io") or host.endswith("remoteok.com"):
+        if parsed.path.rstrip("/") == "/api":  # JSON feed, not a detail page
+            return None
+        return RemoteOKScraper.extract_description
+    if host.endswith("indeed.com"):
+        if parsed.path == IndeedScraper.SEARCH_PATH:
+            return None
+        return IndeedScraper.extract_description
+    return None
+
+
+def _reextract_batch(root: str, entries: List[ArchiveEntry]) -> List[Dict[str, Any]]:
+    """Worker: re-parse one batch of entries (runs in a child process)."""
+    reader = ArchiveReader(root)
+    results: list[Dict[str, Any]] = []
+    for page in reader.read_many(entries):
+        extract = extractor_for(page.url)
+        if extract is None:
+            continue
+        try:
+            description = extract(page.text)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to re-extract %s: %s", page.url, exc)
+            continue
+        results.append(
+            {"url": page.url, "description": description, "fetched_at": page.fetched_at}
+        )
+    return results
+
+
+def reextract(
+    root: str,
+    *,
+    workers: Optional[int] = None,
+    batch_size: int = 500,
+    latest_only: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Re-run description extraction over every archived detail page.
+
+    Entries are grouped by segment and split into batches that are parsed in
+    parallel by *workers* processes (default: one per core). Results are
+    yielded in index order as ``{"url", "description", "fetched_at"}`` dicts.
+
+    Parameters
+    ----------
+    root : str
+        Archive directory.
+    workers : int, optional
+        Number of worker processes; ``1`` parses in the current process.
+    batch_size : int, default 500
+        Records per task sent to a worker.
+    latest_only : bool, default True
+        Only re-parse the most recent fetch of each URL.
+    """
+    reader = ArchiveReader(root)
+    if latest_only:
+        entries = list(reader.latest().values())
+    else:
+        entries = list(reader.entries())
+    entries = [
+        e for e in entries if 200 <= e.status < 300 and extractor_for(e.url) is not None
+    ]
+    entries.sort(key=lambda e: (e.segment, e.offset))  # Sequential reads per segment
+    batches = [entries[i : i + batch_size] for i in range(0, len(entries), batch_size)]
+    logger.info("Re-extracting %d pages in %d batches", len(entries), len(batches))
+
+    if workers == 1 or len(batches) <= 1:
+        for batch in batches:
+            yield from _reextract_batch(root, batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(_reextract_batch, [root] * len(batches), batches):
+            yield from results
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Work with raw-page archives.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rex = sub.add_parser(
+        "reextract", help="Re-parse archived detail pages with the current selectors."
+    )
+    rex.add_argument("archive", help="Archive directory")
+    rex.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Write JSON lines to this file (default: stdout).",
+    )
+    rex.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: number of CPUs).",
+    )
+    rex.add_argument(
+        "--all-versions",
+        action="store_true",
+        help="Re-parse every archived fetch instead of only the latest per URL.",
+    )
+    # Also accepted after the subcommand; SUPPRESS keeps a flag given before it
+    rex.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=argparse.SUPPRESS,
+        help="Increase verbosity level (-v, -vv).",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Increase verbosity level (-v, -vv).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:  # noqa: D401
+    """Entry point for the archive tool."""
+    args = _parse_args()
+    configure_logging(args.verbose)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in reextract(
+            args.archive, workers=args.workers, latest_only=not args.all_versions
+        ):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -2,17 +2,27 @@
 
 Example:
     python -m res_match_crawler.cli "python developer" -l "New York, NY" -n 10 --json
+    python -m res_match_crawler.cli python golang rust --memory-budget 256M --json
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import logging
-from typing import List
+import sys
+from typing import IO, Iterable
 
+from res_match_crawler.archive import ArchiveWriter
+from res_match_crawler.logging_setup import configure_logging
 from res_match_crawler.models import JobPosting
+from res_match_crawler.profiling import profile_crawl, stage
+from res_match_crawler.resilience import Deadline
 from res_match_crawler.scrapers import IndeedScraper
+from res_match_crawler.spill import SpillBuffer, parse_size
+
+logger = logging.getLogger(__name__)
 
 
 def _parse_args() -> argparse.Namespace:
@@ -20,7 +30,12 @@ def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Fetch job postings from Indeed based on keyword and location.",
     )
-    parser.add_argument("keyword", help="Search keyword, e.g. 'python developer'")
+    parser.add_argument(
+        "keywords",
+        nargs="+",
+        metavar="keyword",
+        help="Search keyword(s), e.g. 'python developer'. Results are de-duplicated.",
+    )
     parser.add_argument(
         "-l",
         "--location",
@@ -32,13 +47,59 @@ def _parse_args() -> argparse.Namespace:
         "--limit",
         type=int,
         default=20,
-        help="Maximum number of job postings to retrieve (default: 20)",
+        help="Maximum number of job postings to retrieve per keyword (default: 20)",
     )
     parser.add_argument(
         "--json",
         action="store_true",
         help="Output results as JSON instead of plain text.",
     )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "Overall time budget for the whole run, shared by all keywords; slow detail "
+            "pages are skipped and keywords not yet searched when it runs out are dropped."
+        ),
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Send a duplicate detail-page request when one is slower than the host's p95.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=parse_size,
+        default=None,
+        metavar="SIZE",
+        help=(
+            "Keep at most SIZE (e.g. 256M) of postings in memory; beyond that, results "
+            "spill to disk and are merged back in their original order when output is written."
+        ),
+    )
+    parser.add_argument(
+        "--spill-dir",
+        default=None,
+        metavar="DIR",
+        help="Directory for spilled result segments (default: system temp dir).",
+    )
+    parser.add_argument(
+        "--archive",
+        metavar="DIR",
+        default=None,
+        help="Append every fetched page to this raw-page archive directory.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        default=None,
+        help=(
+            "Profile the run: print per-stage timings and write stages.json, "
+            "crawl.pstats and crawl.collapsed (flamegraph input) to DIR."
+        ),
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -49,31 +110,56 @@ def _parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def _configure_logging(verbosity: int) -> None:
-    """Configure root logger based on *verbosity* flag."""
-    level = logging.WARNING
-    if verbosity == 1:
-        level = logging.INFO
-    elif verbosity >= 2:
-        level = logging.DEBUG
-    logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
-
-
 def main() -> None:  # noqa: D401
     """Entry point for the CLI."""
     args = _parse_args()
-    _configure_logging(args.verbose)
+    configure_logging(args.verbose)
+
+    scraper = IndeedScraper(hedge=args.hedge)
+    archive = None
+    if args.archive:
+        archive = ArchiveWriter(args.archive)
+        archive.attach(scraper.session)
+
+    profiling = profile_crawl(args.profile) if args.profile else contextlib.nullcontext()
+    with profiling as profiler, SpillBuffer(
+        args.memory_budget, spill_dir=args.spill_dir
+    ) as results:
+        run_deadline = Deadline.after(args.deadline)
+        try:
+            for keyword in args.keywords:
+                if run_deadline is not None and run_deadline.expired:
+                    logger.warning("Deadline spent; skipping keyword %r", keyword)
+                    continue
+                remaining = run_deadline.remaining() if run_deadline is not None else None
+                results.extend(
+                    scraper.search(keyword, args.location, limit=args.limit, deadline=remaining)
+                )
+        finally:
+            if archive:
+                archive.close()
+
+        with stage("serialize", scraper=scraper.name):
+            if args.json:
+                _write_json(results, sys.stdout)
+            else:
+                for job in results:
+                    print(job)
+
+    if profiler is not None:
+        print(profiler.format_report(), file=sys.stderr)
 
-    scraper = IndeedScraper()
-    jobs: List[JobPosting] = scraper.search(
-        args.keyword, args.location, limit=args.limit
-    )
 
-    if args.json:
-        print(json.dumps([job.to_dict() for job in jobs], ensure_ascii=False, indent=2))
-    else:
-        for job in jobs:
-            print(job)
+def _write_json(jobs: Iterable[JobPosting], out: IO[str]) -> None:
+    """Stream *jobs* as an indented JSON array without building it in memory."""
+    count = 0
+    out.write("[")
+    for job in jobs:
+        out.write(",\n  " if count else "\n  ")
+        text = json.dumps(job.to_dict(), ensure_ascii=False, indent=2)
+        out.write(text.replace("\n", "\n  "))
+        count += 1
+    out.write("\n]\n" if count else "]\n")
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,508 @@
+"""Long-running crawl daemon with per-board schedules and backpressure.
+
+Instead of paying process start-up and cold sessions on every cron run, the
+daemon keeps one scraper instance per board alive and re-runs each configured
+(board, keyword) pair on its own interval:
+
+- Every schedule is re-run ``interval`` seconds after its previous run
+  completed, randomised by ``±jitter`` (a fraction of the interval). First
+  runs are spread over ``interval * jitter`` so boards are not all hit at
+  start-up.
+- At most ``max_in_flight`` searches run at once, and at most
+  ``max_per_board`` against any single board.
+- Postings are handed to the sink through a bounded queue; when the sink falls
+  behind, producers block and the scheduler stops dispatching new searches.
+- Completion times and already-emitted URLs are checkpointed at most every
+  ``checkpoint_interval`` seconds (and on shutdown), so a restarted daemon
+  neither re-runs fresh schedules nor re-emits postings.
+- With an :class:`~res_match_crawler.archive.ArchiveWriter` (``--archive``),
+  every page fetched by any board's scraper is archived.
+
+Example:
+    python -m res_match_crawler.daemon schedules.json --checkpoint state.json -o jobs.jsonl
+
+where ``schedules.json`` looks like::
+
+    {"schedules": [{"board": "remoteok", "keyword": "python", "interval": 900}]}
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import logging
+import os
+import queue
+import random
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+
+from res_match_crawler.archive import ArchiveWriter
+from res_match_crawler.logging_setup import configure_logging
+from res_match_crawler.models import JobPosting
+from res_match_crawler.scrapers import JobBoardScraper, get_scraper
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[JobPosting], None]
+
+# Queue marker telling the sink thread that a schedule's postings are all enqueued
+_DONE = object()
+# Queue marker telling the sink thread to exit
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """A (board, keyword) pair re-crawled every *interval* seconds."""
+
+    board: str
+    keyword: str
+    location: str = ""
+    interval: float = 3600.0
+    jitter: float = 0.1  # Fraction of the interval, e.g. 0.1 -> ±10%
+    limit: int = 20
+    deadline: Optional[float] = None  # Seconds per run; slow detail pages are skipped
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used in checkpoints."""
+        return f"{self.board.lower()}|{self.keyword}|{self.location}"
+
+    def next_delay(self, rng: random.Random) -> float:
+        """Return the jittered delay until the next run."""
+        spread = self.interval * self.jitter
+        return max(0.0, self.interval + rng.uniform(-spread, spread))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Schedule":
+        """Build a schedule from a config-file entry."""
+        return cls(
+            board=data["board"],
+            keyword=data["keyword"],
+            location=data.get("location", ""),
+            interval=float(data.get("interval", cls.interval)),
+            jitter=float(data.get("jitter", cls.jitter)),
+            limit=int(data.get("limit", cls.limit)),
+            deadline=float(data["deadline"]) if data.get("deadline") is not None else None,
+        )
+
+
+class JsonLinesSink:
+    """Write each posting as one JSON line to *stream* (stdout by default)."""
+
+    def __init__(self, stream: Optional[IO[str]] = None) -> None:
+        self._stream = stream or sys.stdout
+
+    def __call__(self, posting: JobPosting) -> None:
+        self._stream.write(json.dumps(posting.to_dict(), ensure_ascii=False))
+        self._stream.write("\n")
+        self._stream.flush()
+
+
+class CrawlDaemon:
+    """Run :class:`Schedule` entries forever with bounded concurrency.
+
+    Parameters
+    ----------
+    schedules : list of Schedule
+        What to crawl and how often.
+    sink : callable
+        Receives every newly seen posting, from a single dedicated thread.
+    checkpoint_path : str, optional
+        JSON file used to persist progress across restarts.
+    max_in_flight : int, default 4
+        Global cap on concurrently running searches.
+    max_per_board : int, default 2
+        Cap on concurrently running searches against one board.
+    sink_queue_size : int, default 1000
+        Postings buffered between producers and the sink.
+    max_seen : int, default 100_000
+        Number of recently emitted URLs remembered for de-duplication.
+    checkpoint_interval : float, default 30.0
+        Minimum seconds between checkpoint writes. Writing all seen URLs
+        after every completed schedule would stall the sink thread.
+    scraper_factory : callable, optional
+        ``board -> JobBoardScraper``; defaults to :func:`get_scraper`.
+    archive : ArchiveWriter, optional
+        Attached to each scraper's session as it is created. The caller
+        remains responsible for closing it.
+    """
+
+    def __init__(
+        self,
+        schedules: List[Schedule],
+        sink: Sink,
+        *,
+        checkpoint_path: Optional[str] = None,
+        max_in_flight: int = 4,
+        max_per_board: int = 2,
+        sink_queue_size: int = 1000,
+        max_seen: int = 100_000,
+        checkpoint_interval: float = 30.0,
+        scraper_factory: Callable[[str], JobBoardScraper] = get_scraper,
+        archive: Optional[ArchiveWriter] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if max_in_flight < 1 or max_per_board < 1:
+            raise ValueError("max_in_flight and max_per_board must be >= 1")
+
+        self.schedules = {s.key: s for s in schedules}
+        self.sink = sink
+        self.checkpoint_path = checkpoint_path
+        self.max_in_flight = max_in_flight
+        self.max_per_board = max_per_board
+        self.max_seen = max_seen
+        self.checkpoint_interval = checkpoint_interval
+        self._scraper_factory = scraper_factory
+        self.archive = archive
+        self._rng = random.Random(seed)
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=sink_queue_size)
+        self._high_water = max(1, int(sink_queue_size * 0.8))
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, str]] = []
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._board_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._scrapers: Dict[str, JobBoardScraper] = {}
+        self._sink_alive = True
+
+        # Checkpointed state; only mutated by the sink thread once started
+        self._last_run: Dict[str, float] = {}
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._checkpoint_dirty = False
+        self._last_checkpoint = time.monotonic()
+        self._load_checkpoint()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def run(self) -> None:
+        """Block running schedules until :meth:`stop` is called or a signal arrives."""
+        self._install_signal_handlers()
+        self._seed_heap()
+
+        sink_thread = threading.Thread(
+            target=self._drain_sink, name="crawl-daemon-sink", daemon=True
+        )
+        sink_thread.start()
+
+        logger.info(
+            "Crawl daemon started with %d schedules (max_in_flight=%d, max_per_board=%d)",
+            len(self.schedules),
+            self.max_in_flight,
+            self.max_per_board,
+        )
+        with ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="crawl-daemon"
+        ) as pool:
+            try:
+                self._schedule_loop(pool)
+            finally:
+                logger.info("Shutting down; waiting for in-flight searches")
+                self._stop.set()
+                # Leaving the ``with`` block waits for running searches
+
+        # A dead sink never drains the queue, so never block on a full one
+        while self._sink_alive:
+            try:
+                self._queue.put(_STOP, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+        sink_thread.join()
+        self._checkpoint(force=True)
+        logger.info("Crawl daemon stopped")
+
+    def stop(self) -> None:
+        """Request a graceful shutdown; in-flight searches are allowed to finish."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    @property
+    def stopping(self) -> bool:
+        """True once shutdown has been requested."""
+        return self._stop.is_set()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def _seed_heap(self) -> None:
+        now = time.time()
+        for key, schedule in self.schedules.items():
+            last = self._last_run.get(key)
+            if last is None:
+                # Stagger first runs so every board is not hit at the same moment
+                due = now + self._rng.uniform(0.0, schedule.interval * schedule.jitter)
+            else:
+                # Resume where the previous process left off instead of re-running
+                due = max(now, last + schedule.next_delay(self._rng))
+            heapq.heappush(self._heap, (due, key))
+
+    def _schedule_loop(self, pool: ThreadPoolExecutor) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                if not self._heap:
+                    self._cond.wait(timeout=1.0)
+                    continue
+                due, key = self._heap[0]
+                delay = due - time.time()
+                if delay > 0:
+                    self._cond.wait(timeout=min(delay, 1.0))
+                    continue
+                heapq.heappop(self._heap)
+
+            if not self._dispatch(pool, key):
+                # Board saturated or sink behind: retry shortly
+                self._reschedule(key, delay=0.2)
+
+    def _dispatch(self, pool: ThreadPoolExecutor, key: str) -> bool:
+        schedule = self.schedules[key]
+
+        # Backpressure: pause producers while the sink catches up
+        if self._queue.qsize() >= self._high_water:
+            logger.debug("Sink queue above high-water mark; delaying %s", key)
+            return False
+
+        while not self._slots.acquire(timeout=0.5):
+            if self._stop.is_set():
+                return True
+
+        board_slot = self._board_slots.setdefault(
+            schedule.board.lower(), threading.BoundedSemaphore(self.max_per_board)
+        )
+        if not board_slot.acquire(blocking=False):
+            self._slots.release()
+            return False
+
+        future = pool.submit(self._run_schedule, schedule)
+
+        def _finished(_fut: Future[None]) -> None:
+            board_slot.release()
+            self._slots.release()
+            self._reschedule(key, delay=schedule.next_delay(self._rng))
+
+        future.add_done_callback(_finished)
+        return True
+
+    def _reschedule(self, key: str, *, delay: float) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (time.time() + delay, key))
+            self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+    def _scraper(self, board: str) -> JobBoardScraper:
+        # One long-lived instance per board keeps HTTP sessions warm
+        board = board.lower()
+        with self._cond:
+            if board not in self._scrapers:
+                scraper = self._scraper_factory(board)
+                if self.archive is not None:
+                    self.archive.attach(scraper.session)
+                self._scrapers[board] = scraper
+            return self._scrapers[board]
+
+    def _run_schedule(self, schedule: Schedule) -> None:
+        logger.info("Running schedule %s", schedule.key)
+        try:
+            postings = self._scraper(schedule.board).search(
+                schedule.keyword, schedule.location, limit=schedule.limit, deadline=schedule.deadline
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Schedule %s failed: %s", schedule.key, exc)
+            return
+
+        for posting in postings:
+            if not self._put(posting):
+                return
+        # Mark completion only after every posting has been queued
+        self._put((_DONE, schedule.key, time.time()))
+
+    def _put(self, item: Any) -> bool:
+        """Block until *item* is queued; give up only if shutdown stalls the sink."""
+        while True:
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                if self._stop.is_set() and not self._sink_alive:
+                    return False
+
+    # ------------------------------------------------------------------
+    # Sink
+    # ------------------------------------------------------------------
+    def _drain_sink(self) -> None:
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=1.0)
+                except queue.Empty:
+                    self._checkpoint()  # Flush completions once things go quiet
+                    continue
+                if item is _STOP:
+                    break
+                if isinstance(item, tuple) and item and item[0] is _DONE:
+                    _, key, finished_at = item
+                    self._last_run[key] = finished_at
+                    self._checkpoint_dirty = True
+                    self._checkpoint()
+                    continue
+                self._emit(item)
+        finally:
+            self._sink_alive = False
+
+    def _emit(self, posting: JobPosting) -> None:
+        key = posting.dedup_key
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            return
+        self._seen[key] = None
+        if len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        try:
+            self.sink(posting)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Sink failed for %s: %s", posting.url, exc)
+
+    # ------------------------------------------------------------------
+    # Checkpointing and signals
+    # ------------------------------------------------------------------
+    def _load_checkpoint(self) -> None:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", self.checkpoint_path, exc)
+            return
+        self._last_run = {k: float(v) for k, v in state.get("last_run", {}).items()}
+        self._seen = OrderedDict((url, None) for url in state.get("seen", []))
+        logger.info(
+            "Loaded checkpoint with %d schedules and %d seen URLs",
+            len(self._last_run),
+            len(self._seen),
+        )
+
+    def _checkpoint(self, *, force: bool = False) -> None:
+        """Save pending progress if ``checkpoint_interval`` has passed (or *force*)."""
+        if not force:
+            if not self._checkpoint_dirty:
+                return
+            if time.monotonic() - self._last_checkpoint < self.checkpoint_interval:
+                return
+        try:
+            self._save_checkpoint()
+        except OSError as exc:
+            # Keep crawling; the next checkpoint retries
+            logger.error("Failed to write checkpoint %s: %s", self.checkpoint_path, exc)
+            return
+        self._checkpoint_dirty = False
+        self._last_checkpoint = time.monotonic()
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        state = {"last_run": self._last_run, "seen": list(self._seen)}
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        os.replace(tmp_path, self.checkpoint_path)  # Atomic on POSIX and Windows
+
+    def _install_signal_handlers(self) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        def _handler(signum: int, _frame: Any) -> None:
+            logger.info("Received signal %d; stopping", signum)
+            self.stop()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, _handler)
+
+
+def load_schedules(path: str) -> Tuple[List[Schedule], Dict[str, Any]]:
+    """Read a schedules file and return ``(schedules, daemon_options)``."""
+    with open(path, "r", encoding="utf-8") as fh:
+        config = json.load(fh)
+    schedules = [Schedule.from_dict(entry) for entry in config.get("schedules", [])]
+    options = {
+        k: config[k]
+        for k in (
+            "max_in_flight", "max_per_board", "sink_queue_size", "max_seen", "checkpoint_interval"
+        )
+        if k in config
+    }
+    return schedules, options
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Continuously crawl job boards according to a schedules file.",
+    )
+    parser.add_argument("config", help="JSON file with a 'schedules' list")
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="JSON file used to persist progress across restarts.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Append postings as JSON lines to this file (default: stdout).",
+    )
+    parser.add_argument(
+        "--archive",
+        metavar="DIR",
+        default=None,
+        help="Append every page fetched by any board to this raw-page archive directory.",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Increase verbosity level (-v, -vv).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:  # noqa: D401
+    """Entry point for the daemon."""
+    args = _parse_args()
+    configure_logging(args.verbose)
+
+    schedules, options = load_schedules(args.config)
+    stream = open(args.output, "a", encoding="utf-8") if args.output else None
+    archive = ArchiveWriter(args.archive) if args.archive else None
+    try:
+        daemon = CrawlDaemon(
+            schedules,
+            JsonLinesSink(stream),
+            checkpoint_path=args.checkpoint,
+            archive=archive,
+            **options,
+        )
+        daemon.run()
+    finally:
+        if archive:
+            archive.close()
+        if stream:
+            stream.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,262 @@
+"""Structured field extraction: posting dates, salary ranges and locations.
+
+All patterns are compiled once at import time. :func:`extract_batch` makes a
+single pass over a batch of postings and returns one :class:`StructuredFields`
+per posting, which :class:`res_match_crawler.facets.FacetIndex` builds on.
+
+- Dates: ISO timestamps (``2024-05-01T12:00:00+00:00``) and relative phrases
+  ("Posted 3 days ago", "30+ days ago", "Just posted", "yesterday").
+- Salaries: "$120k - $150k", "€60.000 to €75.000 a year", "£45/hour" ...,
+  normalised to an annual range (hourly x 2080, weekly x 52, monthly x 12).
+- Locations: free text ("Remote (Europe)", "Berlin, Germany", "Austin, TX")
+  mapped to canonical tags: ``remote``, countries and regions.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime as _dt
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from res_match_crawler.models import JobPosting
+
+# ----------------------------------------------------------------------
+# Dates
+# ----------------------------------------------------------------------
+_ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})(?!\d)")
+_RELATIVE_DATE_RE = re.compile(
+    r"\b(?:(?P<n>\d+)\+?\s*(?P<unit>minute|min|hour|hr|day|week|month)s?\s+ago"
+    r"|(?P<today>today|just posted|just now)"
+    r"|(?P<yesterday>yesterday))\b",
+    re.IGNORECASE,
+)
+# Description fallback only trusts phrases explicitly introduced as posting dates
+_POSTED_PHRASE_RE = re.compile(r"\bposted\b[:\s]*(?P<rest>[^\n.;]{0,40})", re.IGNORECASE)
+
+_DAYS_PER_UNIT = {"minute": 0, "min": 0, "hour": 0, "hr": 0, "day": 1, "week": 7, "month": 30}
+
+# ----------------------------------------------------------------------
+# Salaries
+# ----------------------------------------------------------------------
+_AMOUNT = r"\d{1,3}(?:[,.]\d{3})+|\d+(?:\.\d+)?"
+_CURRENCY = r"[$€£]|usd|eur|gbp"
+# Reject partial numbers and "$5 million"-style amounts (funding, revenue)
+_NOT_LARGE = r"(?![\d.,]*\d|\s*(?:million|billion|bn|mm?)\b)"
+_SALARY_RE = re.compile(
+    rf"(?P<cur>{_CURRENCY})\s*(?P<lo>{_AMOUNT})\s*(?P<lok>k)?{_NOT_LARGE}"
+    rf"(?:\s*(?:-|–|—|to)\s*(?:{_CURRENCY})?\s*(?P<hi>{_AMOUNT})\s*(?P<hik>k)?{_NOT_LARGE})?"
+    r"(?:\s*(?:/|per|an|a)\s*(?P<period>hour|hr|week|wk|month|mo|year|yr|annum))?",
+    re.IGNORECASE,
+)
+_HOURLY_RE = re.compile(r"\bhourly\b", re.IGNORECASE)
+_THOUSANDS_RE = re.compile(r"\d{1,3}(?:[,.]\d{3})+")
+
+_CURRENCY_CODES = {"$": "USD", "€": "EUR", "£": "GBP", "usd": "USD", "eur": "EUR", "gbp": "GBP"}
+_ANNUAL_MULTIPLIER = {
+    "hour": 2080, "hr": 2080, "week": 52, "wk": 52,
+    "month": 12, "mo": 12, "year": 1, "yr": 1, "annum": 1,
+}
+_MIN_ANNUAL, _MAX_ANNUAL = 1_000.0, 5_000_000.0  # Outside this range it's not a salary
+
+# ----------------------------------------------------------------------
+# Locations
+# ----------------------------------------------------------------------
+REMOTE = "remote"
+
+_REGION_COUNTRIES: Dict[str, Tuple[str, ...]] = {
+    "europe": (
+        "germany", "france", "spain", "portugal", "italy", "netherlands", "belgium",
+        "poland", "sweden", "norway", "denmark", "finland", "ireland", "austria",
+        "switzerland", "czech republic", "romania", "greece", "hungary", "ukraine",
+        "estonia", "lithuania", "latvia", "united kingdom",
+    ),
+    "north america": ("united states", "canada", "mexico"),
+    "latin america": ("brazil", "argentina", "colombia", "chile", "peru", "mexico"),
+    "asia": ("india", "japan", "singapore", "china", "philippines", "vietnam", "indonesia"),
+    "oceania": ("australia", "new zealand"),
+    "africa": ("nigeria", "kenya", "south africa", "egypt"),
+}
+
+# Alias -> canonical country or region
+_LOCATION_ALIASES: Dict[str, str] = {
+    "remote": REMOTE, "anywhere": REMOTE, "worldwide": REMOTE,
+    "work from home": REMOTE, "wfh": REMOTE,
+    "usa": "united states", "us": "united states", "u.s.": "united states",
+    "united states of america": "united states", "america": "united states",
+    "new york": "united states", "san francisco": "united states",
+    "uk": "united kingdom", "england": "united kingdom", "scotland": "united kingdom",
+    "london": "united kingdom",
+    "berlin": "germany", "munich": "germany", "paris": "france", "madrid": "spain",
+    "barcelona": "spain", "lisbon": "portugal", "amsterdam": "netherlands",
+    "dublin": "ireland", "toronto": "canada", "vancouver": "canada",
+    "eu": "europe", "emea": "europe", "latam": "latin america", "apac": "asia",
+    "americas": "north america",
+    # Longer than the bare "america" alias, so they win when both could match
+    "south america": "latin america", "central america": "latin america",
+}
+for _region, _countries in _REGION_COUNTRIES.items():
+    _LOCATION_ALIASES.setdefault(_region, _region)
+    for _country in _countries:
+        _LOCATION_ALIASES.setdefault(_country, _country)
+
+_COUNTRY_REGIONS: Dict[str, Tuple[str, ...]] = {}
+for _region, _countries in _REGION_COUNTRIES.items():
+    for _country in _countries:
+        _COUNTRY_REGIONS[_country] = _COUNTRY_REGIONS.get(_country, ()) + (_region,)
+
+_US_STATES = frozenset(
+    "AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE "
+    "NV NH NJ NM NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY DC".split()
+)
+
+# Longest aliases first so "united states of america" wins over "america"
+_LOCATION_RE = re.compile(
+    r"(?<![\w.])(?:"
+    + "|".join(re.escape(a) for a in sorted(_LOCATION_ALIASES, key=len, reverse=True))
+    + r")(?![\w])",
+    re.IGNORECASE,
+)
+_US_STATE_RE = re.compile(r",\s*([A-Z]{2})\b")
+
+
+@dataclass(frozen=True)
+class StructuredFields:
+    """Normalised facets extracted from one posting."""
+
+    posted_at: Optional[_dt.date] = None
+    salary_min: Optional[float] = None  # Annualised
+    salary_max: Optional[float] = None  # Annualised
+    salary_currency: Optional[str] = None
+    salary_text: Optional[str] = None  # The matched raw text
+    locations: FrozenSet[str] = frozenset()
+
+
+def parse_posted_date(text: str, today: Optional[_dt.date] = None) -> Optional[_dt.date]:
+    """Parse an ISO date or a relative phrase such as "3 days ago"."""
+    if not text:
+        return None
+    match = _ISO_DATE_RE.search(text)
+    if match:
+        try:
+            return _dt.date(int(match[1]), int(match[2]), int(match[3]))
+        except ValueError:
+            return None
+
+    match = _RELATIVE_DATE_RE.search(text)
+    if not match:
+        return None
+    today = today or _dt.date.today()
+    if match["today"]:
+        return today
+    if match["yesterday"]:
+        return today - _dt.timedelta(days=1)
+    days = int(match["n"]) * _DAYS_PER_UNIT[match["unit"].lower()]
+    return today - _dt.timedelta(days=days)
+
+
+def _amount(text: str, thousands: bool) -> float:
+    if _THOUSANDS_RE.fullmatch(text):
+        value = float(text.replace(",", "").replace(".", ""))
+    else:
+        value = float(text)
+    return value * 1000 if thousands else value
+
+
+def parse_salary(
+    text: str,
+) -> Tuple[Optional[float], Optional[float], Optional[str], Optional[str]]:
+    """Return ``(annual_min, annual_max, currency, matched_text)`` from *text*.
+
+    The first plausible amount or range wins. Missing values are None.
+    """
+    if not text:
+        return None, None, None, None
+    for match in _SALARY_RE.finditer(text):
+        lo = _amount(match["lo"], bool(match["lok"]))
+        hi = _amount(match["hi"], bool(match["hik"] or match["lok"])) if match["hi"] else lo
+
+        period = (match["period"] or "").lower()
+        if not period and _HOURLY_RE.search(text):
+            period = "hour"
+        if not period and hi < 1000:
+            if not match["hi"]:
+                continue  # A lone small amount ("$5 off") is not a salary
+            period = "hour"  # "$45 - $60" without a unit is an hourly rate
+        multiplier = _ANNUAL_MULTIPLIER.get(period, 1)
+        lo, hi = sorted((lo * multiplier, hi * multiplier))
+
+        if _MIN_ANNUAL <= lo and hi <= _MAX_ANNUAL:
+            currency = _CURRENCY_CODES[match["cur"].lower()]
+            return lo, hi, currency, match.group(0).strip()
+    return None, None, None, None
+
+
+def normalize_location(text: str, *, expand_regions: bool = True) -> FrozenSet[str]:
+    """Map free-text location to canonical tags (remote, countries, regions).
+
+    With *expand_regions* every country also yields its regions, so a Berlin
+    posting is tagged ``germany`` and ``europe``.
+    """
+    if not text:
+        return frozenset()
+    tags: set[str] = set()
+    for match in _LOCATION_RE.finditer(text):
+        tags.add(_LOCATION_ALIASES[match.group(0).lower()])
+    # A trailing two-letter code is a US state only if no other country was
+    # named: "Munich, DE" is Germany, not Delaware
+    foreign = any(tag in _COUNTRY_REGIONS and tag != "united states" for tag in tags)
+    if not foreign and any(state in _US_STATES for state in _US_STATE_RE.findall(text)):
+        tags.add("united states")
+    if expand_regions:
+        for tag in list(tags):
+            tags.update(_COUNTRY_REGIONS.get(tag, ()))
+    return frozenset(tags)
+
+
+def extract_fields(posting: JobPosting, today: Optional[_dt.date] = None) -> StructuredFields:
+    """Extract :class:`StructuredFields` from a single posting."""
+    posted_at = posting.posted_at
+    if posted_at is None:
+        phrase = _POSTED_PHRASE_RE.search(posting.description)
+        if phrase:
+            posted_at = parse_posted_date(phrase["rest"], today)
+
+    lo, hi, currency, salary_text = parse_salary(posting.salary or "")
+    if lo is None:
+        lo, hi, currency, salary_text = parse_salary(posting.description)
+
+    return StructuredFields(
+        posted_at=posted_at,
+        salary_min=lo,
+        salary_max=hi,
+        salary_currency=currency,
+        salary_text=salary_text,
+        locations=normalize_location(posting.location),
+    )
+
+
+def extract_batch(
+    postings: Iterable[JobPosting], today: Optional[_dt.date] = None
+) -> List[StructuredFields]:
+    """Extract fields for every posting in one pass (relative dates use *today*)."""
+    today = today or _dt.date.today()
+    return [extract_fields(posting, today) for posting in postings]
+
+
+def enrich(
+    postings: Sequence[JobPosting], fields: Optional[Sequence[StructuredFields]] = None
+) -> List[JobPosting]:
+    """Return copies of *postings* with ``posted_at`` and ``salary`` filled when missing."""
+    fields = fields if fields is not None else extract_batch(postings)
+    enriched: list[JobPosting] = []
+    for posting, extracted in zip(postings, fields):
+        enriched.append(
+            dataclasses.replace(
+                posting,
+                posted_at=posting.posted_at or extracted.posted_at,
+                salary=posting.salary or extracted.salary_text,
+            )
+        )
+    return enriched
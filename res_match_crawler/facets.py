@@ -0,0 +1,188 @@
+"""Facet index over job postings: location, salary range, currency and posting date.
+
+The index is built once from a batch of postings and answers conjunctive
+filters without scanning every record:
+
+- each location tag maps to a bitset (a Python ``int``) of posting ids, so
+  "remote OR Europe" is a single bitwise OR; salary currencies are indexed
+  the same way;
+- salaries and posting dates are kept as sorted arrays. A range filter is a
+  binary search, and only the matching slice is turned into a bitset;
+- filters are combined with bitwise AND and only the surviving ids are
+  materialised.
+
+Salaries are not converted between currencies: bounds are compared with
+each posting's own figures, so combine them with ``currency`` to compare like
+with like.
+
+Usage:
+    index = FacetIndex.build(postings)
+    hits = index.query(locations=["remote", "Europe"], min_salary=100_000,
+                       currency="USD", posted_within_days=7)
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime as _dt
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from res_match_crawler.extraction import StructuredFields, extract_batch, normalize_location
+from res_match_crawler.models import JobPosting
+
+
+def _bitset(ids: Iterable[int], size: int) -> int:
+    """Pack *ids* into an int bitset (bit *i* set for id *i*)."""
+    buf = bytearray((size + 7) // 8)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _iter_bits(bits: int, size: int) -> Iterator[int]:
+    """Yield the positions of set bits in ascending order."""
+    data = bits.to_bytes((size + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+
+
+class _SortedColumn:
+    """Ids ordered by a numeric key, for range lookups via binary search."""
+
+    def __init__(self, pairs: Iterable[Tuple[float, int]]) -> None:
+        ordered = sorted(pairs)
+        self.keys: List[float] = [k for k, _ in ordered]
+        self.ids: List[int] = [i for _, i in ordered]
+
+    def range_ids(self, low: Optional[float] = None, high: Optional[float] = None) -> List[int]:
+        start = 0 if low is None else bisect.bisect_left(self.keys, low)
+        stop = len(self.keys) if high is None else bisect.bisect_right(self.keys, high)
+        return self.ids[start:stop]
+
+
+class FacetIndex:
+    """Immutable facet index over a sequence of postings."""
+
+    def __init__(self, postings: Sequence[JobPosting], fields: Sequence[StructuredFields]) -> None:
+        if len(postings) != len(fields):
+            raise ValueError("postings and fields must have the same length")
+        self.postings = list(postings)
+        self.fields = list(fields)
+        self._size = len(self.postings)
+        self._all = (1 << self._size) - 1
+
+        tag_ids: Dict[str, List[int]] = {}
+        for i, f in enumerate(self.fields):
+            for tag in f.locations:
+                tag_ids.setdefault(tag, []).append(i)
+        self._locations: Dict[str, int] = {
+            tag: _bitset(ids, self._size) for tag, ids in tag_ids.items()
+        }
+
+        currency_ids: Dict[str, List[int]] = {}
+        for i, f in enumerate(self.fields):
+            if f.salary_currency:
+                currency_ids.setdefault(f.salary_currency, []).append(i)
+        self._currencies: Dict[str, int] = {
+            code: _bitset(ids, self._size) for code, ids in currency_ids.items()
+        }
+
+        # A posting matches "salary >= X" when the top of its range reaches X
+        self._salary_max = _SortedColumn(
+            (f.salary_max, i) for i, f in enumerate(self.fields) if f.salary_max is not None
+        )
+        self._salary_min = _SortedColumn(
+            (f.salary_min, i) for i, f in enumerate(self.fields) if f.salary_min is not None
+        )
+        self._posted = _SortedColumn(
+            (f.posted_at.toordinal(), i) for i, f in enumerate(self.fields) if f.posted_at
+        )
+
+    @classmethod
+    def build(
+        cls, postings: Sequence[JobPosting], today: Optional[_dt.date] = None
+    ) -> "FacetIndex":
+        """Extract structured fields from *postings* and index them."""
+        return cls(postings, extract_batch(postings, today))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def location_tags(self) -> Dict[str, int]:
+        """Number of postings per location tag."""
+        return {tag: bin(bits).count("1") for tag, bits in self._locations.items()}
+
+    @property
+    def currencies(self) -> Dict[str, int]:
+        """Number of postings per salary currency code."""
+        return {code: bin(bits).count("1") for code, bits in self._currencies.items()}
+
+    def match(
+        self,
+        *,
+        locations: Optional[Iterable[str]] = None,
+        min_salary: Optional[float] = None,
+        max_salary: Optional[float] = None,
+        currency: Optional[str] = None,
+        posted_since: Optional[_dt.date] = None,
+        posted_within_days: Optional[int] = None,
+        today: Optional[_dt.date] = None,
+    ) -> int:
+        """Return the bitset of postings matching every given filter.
+
+        Parameters
+        ----------
+        locations : iterable of str, optional
+            Free-text locations OR-ed together ("remote", "Europe", "Berlin").
+        min_salary, max_salary : float, optional
+            Annual salary bounds; a posting matches when its range overlaps.
+            Compared in each posting's own currency, without conversion.
+        currency : str, optional
+            Salary currency code ("USD", "EUR", ...); postings without a
+            salary never match.
+        posted_since : date, optional
+            Earliest posting date (inclusive).
+        posted_within_days : int, optional
+            Shorthand for ``posted_since = today - N days``.
+        """
+        bits = self._all
+
+        if locations is not None:
+            wanted: set[str] = set()
+            for text in locations:
+                tags = normalize_location(text, expand_regions=False)
+                wanted |= tags or {text.strip().lower()}
+            loc_bits = 0
+            for tag in wanted:
+                loc_bits |= self._locations.get(tag, 0)
+            bits &= loc_bits
+
+        if posted_within_days is not None:
+            since = (today or _dt.date.today()) - _dt.timedelta(days=posted_within_days)
+            posted_since = max(posted_since, since) if posted_since else since
+        if posted_since is not None and bits:
+            ids = self._posted.range_ids(low=posted_since.toordinal())
+            bits &= _bitset(ids, self._size)
+
+        if currency is not None:
+            bits &= self._currencies.get(currency.strip().upper(), 0)
+
+        if min_salary is not None and bits:
+            bits &= _bitset(self._salary_max.range_ids(low=min_salary), self._size)
+        if max_salary is not None and bits:
+            bits &= _bitset(self._salary_min.range_ids(high=max_salary), self._size)
+
+        return bits
+
+    def query(self, **filters) -> List[JobPosting]:  # type: ignore[no-untyped-def]
+        """Return postings matching *filters* (see :meth:`match`) in index order."""
+        return [self.postings[i] for i in _iter_bits(self.match(**filters), self._size)]
+
+    def count(self, **filters) -> int:  # type: ignore[no-untyped-def]
+        """Return the number of postings matching *filters* (see :meth:`match`)."""
+        return bin(self.match(**filters)).count("1")
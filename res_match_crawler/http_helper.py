@@ -2,7 +2,10 @@
 
 This module provides a configured `requests.Session` with:
 - Default User-Agent identifying the crawler.
-- Automatic retries with exponential backoff for transient errors (5xx, connection issues).
+- Automatic retries with exponential backoff for transient errors (5xx, connection issues),
+  performed by :func:`res_match_crawler.resilience.resilient_get` so they respect deadlines.
+- Coalescing of concurrent identical requests (see :mod:`res_match_crawler.singleflight`).
+- Per-host circuit breakers, optional hedging and deadlines (see :mod:`res_match_crawler.resilience`).
 
 Usage:
     from res_match_crawler.http_helper import get_html
@@ -15,8 +18,8 @@ import logging
 from typing import Any, Dict, Optional
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry  # type: ignore
+from res_match_crawler.resilience import Deadline, resilient_get
+from res_match_crawler.singleflight import request_key, shared
 
 logger = logging.getLogger(__name__)
 
@@ -27,25 +30,18 @@ DEFAULT_HEADERS: Dict[str, str] = {
 }
 
 
-def _create_session(
-    retries: int = 3,
-    backoff_factor: float = 0.5,
-    status_forcelist: tuple[int, ...] = (500, 502, 503, 504),
-) -> requests.Session:
-    """Return a `requests.Session` pre-configured with retry logic and headers."""
+# Retry policy applied per attempt by resilient_get. The session's adapter must
+# not retry by itself: hidden retries would each get the full timeout again,
+# overrunning deadlines, and would count as a single breaker failure.
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+STATUS_FORCELIST: tuple[int, ...] = (500, 502, 503, 504)
 
-    retry_strategy = Retry(
-        total=retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=status_forcelist,
-        allowed_methods=("HEAD", "GET", "OPTIONS"),
-        raise_on_status=False,
-    )
 
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+def _create_session() -> requests.Session:
+    """Return a `requests.Session` pre-configured with default headers."""
+
     session = requests.Session()
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
     session.headers.update(DEFAULT_HEADERS)
 
     return session
@@ -55,12 +51,19 @@ def _create_session(
 _SESSION: requests.Session = _create_session()
 
 
+def get_session() -> requests.Session:
+    """Return the shared session used by :func:`get_html` (e.g. to attach hooks)."""
+    return _SESSION
+
+
 def get_html(
     url: str,
     *,
     params: Optional[Dict[str, Any]] = None,
     timeout: int | float = 10,
     headers: Optional[Dict[str, str]] = None,
+    deadline: Optional[Deadline] = None,
+    hedge: bool = False,
 ) -> str:
     """Fetch the given *url* and return response text.
 
@@ -74,22 +77,53 @@ def get_html(
         Request timeout seconds.
     headers : dict, optional
         Extra headers to merge with the defaults.
+    deadline : Deadline, optional
+        Overall budget; the timeout of each attempt is clamped to the time
+        remaining and no retry starts once it is spent.
+    hedge : bool, default False
+        Send a duplicate request if the host's p95 latency elapses first.
+
+    Concurrent calls with the same normalized URL, params, headers, timeout
+    and hedging are coalesced into one request whose result (or error) they
+    all share. A caller joining another's fetch waits within its own
+    *deadline*, and retries rather than inheriting the other caller's
+    ``DeadlineExceeded``.
 
     Raises
     ------
     requests.HTTPError
         If the final response status is not 2xx.
+    res_match_crawler.resilience.CircuitOpenError
+        If the host's circuit breaker is open.
+    res_match_crawler.resilience.DeadlineExceeded
+        If *deadline* is spent before the page is fetched.
     """
     hdrs = DEFAULT_HEADERS.copy()
     if headers:
         hdrs.update(headers)
 
-    logger.debug("Fetching URL %s with params=%s", url, params)
-    response = _SESSION.get(url, params=params, timeout=timeout, headers=hdrs)
-    try:
-        response.raise_for_status()
-    except requests.HTTPError as e:
-        logger.error("Request failed: %s", e)
-        raise
-
-    return response.text
+    def _fetch() -> str:
+        logger.debug("Fetching URL %s with params=%s", url, params)
+        response = resilient_get(
+            _SESSION,
+            url,
+            params=params,
+            timeout=timeout,
+            headers=hdrs,
+            deadline=deadline,
+            hedge=hedge,
+            retries=RETRIES,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=STATUS_FORCELIST,
+        )
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            logger.error("Request failed: %s", e)
+            raise
+
+        return response.text
+
+    # Concurrent callers asking for the same page on the same terms share a single fetch
+    key = request_key(url, params, headers, options={"timeout": timeout, "hedge": hedge})
+    return shared(key, _fetch, deadline)
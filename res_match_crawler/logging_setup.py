@@ -0,0 +1,15 @@
+"""Logging configuration shared by the command-line entry points."""
+
+from __future__ import annotations
+
+import logging
+
+
+def configure_logging(verbosity: int) -> None:
+    """Configure root logger based on *verbosity* flag (``-v`` count)."""
+    level = logging.WARNING
+    if verbosity == 1:
+        level = logging.INFO
+    elif verbosity >= 2:
+        level = logging.DEBUG
+    logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
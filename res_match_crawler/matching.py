@@ -0,0 +1,219 @@
+"""Incremental resume-to-job matching with standing top-k queries.
+
+Resumes are registered once and turned into sparse, L2-normalised term
+vectors. New postings are scored only against those stored vectors. An
+inverted index from term to ``(resume, weight)`` means each posting touches
+only the resumes that share a term with it. Each resume keeps its best *k*
+matches in a min-heap, so the cost of a crawl cycle grows with the number of
+new postings, not with the corpus.
+
+Scores are cosine similarities of sublinear term-frequency vectors. IDF
+weighting is deliberately left out: it depends on the whole corpus and would
+force every stored score to be recomputed whenever postings arrive.
+
+Usage:
+    matcher = StandingQueryMatcher()
+    matcher.register("alice", resume_text, k=20)
+    matcher.subscribe(lambda change: print(change.resume_id, change.entered))
+    matcher.add_postings(scraper.search("python"))
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from res_match_crawler.models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+_STOPWORDS = frozenset(
+    """a an and are as at be by for from has have in is it its of on or our that the
+    their this to we will with you your who what us they them""".split()
+)
+
+Vector = Dict[str, float]
+
+
+def vectorize(text: str) -> Vector:
+    """Return an L2-normalised sublinear term-frequency vector for *text*."""
+    counts = Counter(t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS)
+    weights = {term: 1.0 + math.log(n) for term, n in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {term: w / norm for term, w in weights.items()}
+
+
+def posting_text(posting: JobPosting) -> str:
+    """Text of *posting* used for matching (title counted twice for emphasis)."""
+    return f"{posting.title}\n{posting.title}\n{posting.description}"
+
+
+@dataclass(frozen=True, order=True)
+class Match:
+    """A scored posting in a resume's top-k."""
+
+    score: float
+    posting: JobPosting = field(compare=False)
+
+
+@dataclass(frozen=True)
+class RankingChange:
+    """Notification that a resume's top-k changed during :meth:`add_postings`."""
+
+    resume_id: str
+    entered: List[Match]  # New postings that made the top-k
+    evicted: List[Match]  # Postings pushed out of the top-k
+    top: List[Match]  # The new top-k, best first
+
+
+class _Standing:
+    """Per-resume state: its vector and a size-k min-heap of matches."""
+
+    def __init__(self, vector: Vector, k: int) -> None:
+        self.vector = vector
+        self.k = k
+        # (score, seq, posting): seq breaks ties without comparing postings
+        self.heap: List[Tuple[float, int, JobPosting]] = []
+
+
+Listener = Callable[[RankingChange], None]
+
+
+class StandingQueryMatcher:
+    """Maintain each registered resume's top-k postings as postings stream in.
+
+    Parameters
+    ----------
+    default_k : int, default 10
+        Size of each resume's ranking unless overridden in :meth:`register`.
+    min_score : float, default 0.05
+        Matches scoring below this never enter a ranking.
+    """
+
+    def __init__(self, *, default_k: int = 10, min_score: float = 0.05) -> None:
+        self.default_k = default_k
+        self.min_score = min_score
+        self._lock = threading.Lock()
+        self._resumes: Dict[str, _Standing] = {}
+        self._index: Dict[str, List[Tuple[str, float]]] = {}
+        self._seen: Set[str] = set()
+        self._seq = itertools.count()
+        self._listeners: List[Listener] = []
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+    def register(self, resume_id: str, text: str, *, k: Optional[int] = None) -> None:
+        """Register (or replace) a resume; it is scored against postings added from now on."""
+        vector = vectorize(text)
+        with self._lock:
+            previous = self._resumes.get(resume_id)
+            if previous is not None:
+                self._drop_from_index(resume_id, previous.vector)
+            self._resumes[resume_id] = _Standing(vector, k or self.default_k)
+            for term, weight in vector.items():
+                self._index.setdefault(term, []).append((resume_id, weight))
+
+    def unregister(self, resume_id: str) -> None:
+        """Forget a resume and its ranking."""
+        with self._lock:
+            standing = self._resumes.pop(resume_id, None)
+            if standing is not None:
+                self._drop_from_index(resume_id, standing.vector)
+
+    def _drop_from_index(self, resume_id: str, vector: Vector) -> None:
+        for term in vector:
+            entries = self._index.get(term)
+            if not entries:
+                continue
+            entries[:] = [e for e in entries if e[0] != resume_id]
+            if not entries:
+                del self._index[term]
+
+    def subscribe(self, listener: Listener) -> None:
+        """Call *listener* with a :class:`RankingChange` whenever a ranking changes."""
+        self._listeners.append(listener)
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+    def add_postings(self, postings: Iterable[JobPosting]) -> List[RankingChange]:
+        """Score new postings against every registered resume and update rankings.
+
+        Postings already seen (by :attr:`JobPosting.dedup_key`) are ignored. Returns the changes, which
+        are also delivered to subscribers.
+        """
+        with self._lock:
+            # Heap items with a seq from here on were added by this batch
+            batch_start = next(self._seq)
+            touched: Dict[str, None] = {}  # Ordered set of resumes whose heap changed
+            evicted: Dict[str, List[Match]] = {}
+
+            for posting in postings:
+                key = posting.dedup_key
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+
+                scores: Dict[str, float] = {}
+                for term, weight in vectorize(posting_text(posting)).items():
+                    for resume_id, resume_weight in self._index.get(term, ()):
+                        scores[resume_id] = scores.get(resume_id, 0.0) + weight * resume_weight
+
+                seq = next(self._seq)
+                for resume_id, score in scores.items():
+                    if score < self.min_score:
+                        continue
+                    standing = self._resumes[resume_id]
+                    item = (score, seq, posting)
+                    if len(standing.heap) < standing.k:
+                        heapq.heappush(standing.heap, item)
+                        dropped = None
+                    elif score > standing.heap[0][0]:
+                        dropped = heapq.heapreplace(standing.heap, item)
+                    else:
+                        continue
+                    touched[resume_id] = None
+                    # Postings that enter and leave within this batch were never reported
+                    if dropped is not None and dropped[1] < batch_start:
+                        evicted.setdefault(resume_id, []).append(Match(dropped[0], dropped[2]))
+
+            changes = []
+            for resume_id in touched:
+                heap = self._resumes[resume_id].heap
+                new_items = sorted((seq, score, p) for score, seq, p in heap if seq > batch_start)
+                change = RankingChange(
+                    resume_id=resume_id,
+                    entered=[Match(score, p) for _, score, p in new_items],
+                    evicted=evicted.get(resume_id, []),
+                    top=self._top_locked(resume_id),
+                )
+                if change.entered or change.evicted:
+                    changes.append(change)
+
+        for change in changes:
+            for listener in self._listeners:
+                try:
+                    listener(change)
+                except Exception as exc:  # noqa: BLE001
+                    logger.error("Ranking listener failed for %s: %s", change.resume_id, exc)
+        return changes
+
+    def top(self, resume_id: str) -> List[Match]:
+        """Return *resume_id*'s current top-k, best first."""
+        with self._lock:
+            return self._top_locked(resume_id)
+
+    def _top_locked(self, resume_id: str) -> List[Match]:
+        heap = self._resumes[resume_id].heap
+        return [Match(score, posting) for score, _, posting in sorted(heap, reverse=True)]
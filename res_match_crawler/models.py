@@ -19,9 +19,20 @@ class JobPosting:
     posted_at: Optional[_dt.date] = None  # Publication date if available
     salary: Optional[str] = None  # Raw salary text if scraped
 
+    @property
+    def dedup_key(self) -> str:
+        """Identity used to spot the same posting across searches and crawl cycles."""
+        return self.url or f"{self.company}|{self.title}"
+
     def to_dict(self) -> Dict[str, Any]:
-        """Return a plain dict representation, useful for JSON serialization."""
-        return asdict(self)
+        """Return a plain dict representation, useful for JSON serialization.
+
+        ``posted_at`` is rendered as an ISO date string (or None).
+        """
+        data = asdict(self)
+        if self.posted_at is not None:
+            data["posted_at"] = self.posted_at.isoformat()
+        return data
 
     def __str__(self) -> str:  # noqa: DunderStr
         """Human-readable string representation (single line)."""
@@ -0,0 +1,262 @@
+"""Per-stage profiling for crawl runs.
+
+Library code marks its work with :func:`stage`; the marks cost almost nothing
+unless a profiler is active. Inside :func:`profile_crawl` every stage records
+its *exclusive* wall-clock and CPU time (time spent in nested stages is
+attributed to those stages) per ``(scraper, stage)`` label. Optionally:
+
+- a cProfile capture of the calling thread, written as ``crawl.pstats``;
+- a sampling profiler over all threads currently inside a stage, written as
+  ``crawl.collapsed`` in the collapsed-stack format consumed by
+  ``flamegraph.pl`` / speedscope, with each stack rooted at its
+  ``scraper:stage`` labels.
+
+Scraper methods that make up a whole stage use the :func:`scraper_stage`
+decorator instead, which labels the stage with the scraper's ``name``.
+
+Usage:
+    from res_match_crawler.profiling import profile_crawl
+
+    with profile_crawl("profile-out/") as profiler:
+        jobs = scraper.search("python")
+    print(profiler.format_report())
+
+Stages used by the scrapers: ``search``, ``fetch``, ``parse``, ``filter``,
+``build`` and, in the CLI, ``serialize``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+PSTATS_NAME = "crawl.pstats"
+COLLAPSED_NAME = "crawl.collapsed"
+STAGES_NAME = "stages.json"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_NULL_STAGE: ContextManager[None] = contextlib.nullcontext()
+_ACTIVE: Optional["CrawlProfiler"] = None
+
+
+@dataclass
+class StageStats:
+    """Accumulated exclusive timings for one ``(scraper, stage)`` label."""
+
+    scraper: str
+    stage: str
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+class _Frame:
+    __slots__ = ("scraper", "stage", "wall0", "cpu0", "child_wall", "child_cpu")
+
+    def __init__(self, scraper: str, stage: str) -> None:
+        self.scraper = scraper
+        self.stage = stage
+        self.wall0 = time.perf_counter()
+        self.cpu0 = time.thread_time()
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+
+
+def stage(name: str, scraper: Optional[str] = None) -> ContextManager[None]:
+    """Mark a block of work as stage *name* of *scraper*.
+
+    When *scraper* is omitted it is inherited from the enclosing stage on the
+    same thread. Returns a no-op context manager when no profiler is active.
+    """
+    profiler = _ACTIVE
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name, scraper)
+
+
+def scraper_stage(name: str) -> Callable[[F], F]:
+    """Decorate a scraper method so every call runs as stage *name* of ``self.name``."""
+
+    def decorate(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            with stage(name, scraper=self.name):
+                return method(self, *args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class CrawlProfiler:
+    """Collects per-stage timings, and optionally cProfile and stack samples."""
+
+    def __init__(self, *, cprofile: bool = False, sample_interval: Optional[float] = None) -> None:
+        self.sample_interval = sample_interval
+        self.stats: Dict[Tuple[str, str], StageStats] = {}
+        self.samples: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stacks: Dict[int, List[_Frame]] = {}
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wall0 = 0.0
+        self.wall = 0.0
+
+    @contextlib.contextmanager
+    def stage(self, name: str, scraper: Optional[str] = None) -> Iterator[None]:
+        """Time the enclosed block; see :func:`stage`."""
+        stack = self._stacks.setdefault(threading.get_ident(), [])
+        if scraper is None:
+            scraper = stack[-1].scraper if stack else "-"
+        frame = _Frame(scraper, name)
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            wall = time.perf_counter() - frame.wall0
+            cpu = time.thread_time() - frame.cpu0
+            if stack:
+                stack[-1].child_wall += wall
+                stack[-1].child_cpu += cpu
+            self._record(scraper, name, wall - frame.child_wall, cpu - frame.child_cpu)
+
+    def _record(self, scraper: str, name: str, wall: float, cpu: float) -> None:
+        with self._lock:
+            entry = self.stats.get((scraper, name))
+            if entry is None:
+                entry = self.stats[(scraper, name)] = StageStats(scraper, name)
+            entry.calls += 1
+            entry.wall += wall
+            entry.cpu += cpu
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Activate the profiler for the whole process."""
+        global _ACTIVE
+        if _ACTIVE is not None:
+            raise RuntimeError("A crawl profiler is already active")
+        _ACTIVE = self
+        self._wall0 = time.perf_counter()
+        if self.sample_interval:
+            self._sampler = threading.Thread(
+                target=self._sample_loop, name="crawl-profiler-sampler", daemon=True
+            )
+            self._sampler.start()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    def stop(self) -> None:
+        """Deactivate the profiler and stop the sampler."""
+        global _ACTIVE
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.wall = time.perf_counter() - self._wall0
+        _ACTIVE = None
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        assert self.sample_interval is not None
+        while not self._stop.wait(self.sample_interval):
+            for tid, frame in sys._current_frames().items():
+                stack = list(self._stacks.get(tid, ()))
+                if tid == own or not stack:
+                    continue  # Idle or waiting threads outside any stage would swamp the graph
+                labels = [f"{f.scraper}:{f.stage}" for f in stack]
+                calls: List[str] = []
+                current: Any = frame
+                while current is not None:
+                    code = current.f_code
+                    calls.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    )
+                    current = current.f_back
+                key = ";".join(labels + calls[::-1])
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def format_report(self) -> str:
+        """Return a table of stages sorted by exclusive wall time."""
+        rows = sorted(self.stats.values(), key=lambda s: s.wall, reverse=True)
+        total = sum(s.wall for s in rows) or 1.0
+        lines = [
+            f"{'scraper':<14} {'stage':<10} {'calls':>7} {'wall s':>9} {'cpu s':>9} {'wall %':>7}"
+        ]
+        for s in rows:
+            lines.append(
+                f"{s.scraper:<14} {s.stage:<10} {s.calls:>7} {s.wall:>9.3f} {s.cpu:>9.3f} "
+                f"{100 * s.wall / total:>6.1f}%"
+            )
+        lines.append(f"total run wall time: {self.wall:.3f}s")
+        return "\n".join(lines)
+
+    def write(self, output_dir: str) -> None:
+        """Write ``stages.json`` and, when captured, pstats and collapsed stacks."""
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, STAGES_NAME), "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "wall": self.wall,
+                    "stages": [vars(s) for s in self.stats.values()],
+                },
+                fh,
+                indent=2,
+            )
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(os.path.join(output_dir, PSTATS_NAME))
+        if self.samples:
+            with open(os.path.join(output_dir, COLLAPSED_NAME), "w", encoding="utf-8") as fh:
+                for key, count in sorted(self.samples.items()):
+                    fh.write(f"{key} {count}\n")
+
+
+@contextlib.contextmanager
+def profile_crawl(
+    output_dir: Optional[str] = None,
+    *,
+    cprofile: bool = True,
+    sample_interval: Optional[float] = 0.005,
+) -> Iterator[CrawlProfiler]:
+    """Profile the enclosed crawl and write results to *output_dir* (if given).
+
+    Parameters
+    ----------
+    output_dir : str, optional
+        Directory for ``stages.json``, ``crawl.pstats`` and ``crawl.collapsed``.
+    cprofile : bool, default True
+        Capture a deterministic cProfile of the calling thread.
+    sample_interval : float or None, default 0.005
+        Seconds between stack samples of all threads; None disables sampling.
+    """
+    profiler = CrawlProfiler(cprofile=cprofile, sample_interval=sample_interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        if output_dir:
+            profiler.write(output_dir)
+            logger.info("Wrote crawl profile to %s", output_dir)
@@ -0,0 +1,403 @@
+"""Tail-latency controls: per-host circuit breakers, hedged requests and deadlines.
+
+- :class:`CircuitBreaker` -- after ``failure_threshold`` consecutive failures
+  against a host, calls fail fast with :class:`CircuitOpenError` for
+  ``recovery_timeout`` seconds. After that, a single probe request is let
+  through. Success closes the circuit and failure re-opens it.
+- Hedging -- if a request has not answered within the host's observed p95
+  latency, a duplicate is sent and whichever response arrives first wins.
+  A per-host :class:`HedgeBudget` caps hedges at a small fraction of
+  requests, so a degraded host does not get its load doubled.
+- :class:`Deadline` -- an overall time budget for a search. Per-request
+  timeouts are clamped to what is left, retries are skipped when their
+  backoff would not fit, and :class:`DeadlineExceeded` is raised once it is
+  spent. A timeout that fires only because the deadline ran out is not
+  held against the host.
+
+All three are applied by :func:`resilient_get`, which the scrapers and
+:func:`res_match_crawler.http_helper.get_html` use in place of ``session.get``.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+import urllib.parse as _urlparse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+import requests
+
+from res_match_crawler.profiling import stage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised when a search's overall deadline has been spent."""
+
+
+class Deadline:
+    """Absolute point in time by which a unit of work must finish."""
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> Optional["Deadline"]:
+        """Return a deadline *seconds* from now, or None when *seconds* is None."""
+        return None if seconds is None else cls(seconds)
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """True once the deadline has passed."""
+        return self.remaining() <= 0.0
+
+    def clamp(self, timeout: Optional[float]) -> float:
+        """Return *timeout* reduced to the time remaining.
+
+        Raises
+        ------
+        DeadlineExceeded
+            If no time is left.
+        """
+        remaining = self.remaining()
+        if remaining <= 0.0:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:.1f}s exceeded")
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host (thread-safe)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: ``closed``, ``open`` or ``half-open``."""
+        with self._lock:
+            return self._state
+
+    def before_call(self, name: str = "") -> None:
+        """Reserve permission to call; raise :class:`CircuitOpenError` if refused."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    raise CircuitOpenError(f"Circuit open for {name or 'host'}")
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open: let exactly one probe through
+            if self._probe_in_flight:
+                raise CircuitOpenError(f"Circuit half-open for {name or 'host'}; probe in flight")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give up a reserved call without counting it as a success or failure."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit when the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning("Opening circuit after %d failures", self._failures)
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Sliding window of recent request latencies for one host."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self.min_samples = min_samples
+        self._samples: Deque[float] = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Add one observed latency."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the *q* quantile (0..1), or None with too few samples."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgeBudget:
+    """Token bucket limiting hedged requests to a fraction of all requests.
+
+    Every request earns *ratio* tokens (up to *burst*); a hedge spends one.
+    """
+
+    def __init__(self, ratio: float = 0.05, burst: float = 5.0) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Earn hedge credit for one request."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Spend one token for a hedge; False when the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+_REGISTRY_LOCK = threading.Lock()
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_LATENCIES: Dict[str, LatencyTracker] = {}
+_HEDGE_BUDGETS: Dict[str, HedgeBudget] = {}
+
+# Shared by all hedged calls; the losing request finishes in the background
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+
+def _host(url: str) -> str:
+    return (_urlparse.urlsplit(url).netloc or url).lower()
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """Return the circuit breaker for *url*'s host, creating it on first use."""
+    host = _host(url)
+    with _REGISTRY_LOCK:
+        if host not in _BREAKERS:
+            _BREAKERS[host] = CircuitBreaker()
+        return _BREAKERS[host]
+
+
+def latency_for(url: str) -> LatencyTracker:
+    """Return the latency tracker for *url*'s host, creating it on first use."""
+    host = _host(url)
+    with _REGISTRY_LOCK:
+        if host not in _LATENCIES:
+            _LATENCIES[host] = LatencyTracker()
+        return _LATENCIES[host]
+
+
+def hedge_budget_for(url: str) -> HedgeBudget:
+    """Return the hedge budget for *url*'s host, creating it on first use."""
+    host = _host(url)
+    with _REGISTRY_LOCK:
+        if host not in _HEDGE_BUDGETS:
+            _HEDGE_BUDGETS[host] = HedgeBudget()
+        return _HEDGE_BUDGETS[host]
+
+
+def reset() -> None:
+    """Forget all breaker state and latency history (mainly for tests)."""
+    with _REGISTRY_LOCK:
+        _BREAKERS.clear()
+        _LATENCIES.clear()
+        _HEDGE_BUDGETS.clear()
+
+
+def hedged(fn: Callable[[], T], delay: float, budget: Optional[HedgeBudget] = None) -> T:
+    """Call *fn*; if it has not returned after *delay* seconds, race a second call.
+
+    *delay* counts from when the first call starts running, not from when it
+    was queued on the shared pool. No second call is made if *budget* has
+    no tokens left. The first successful result is returned. If both calls
+    fail, the last error is raised.
+    """
+    started = threading.Event()
+
+    def _first() -> T:
+        started.set()
+        return fn()
+
+    first = _HEDGE_POOL.submit(_first)
+    started.wait()
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    if budget is not None and not budget.try_spend():
+        logger.debug("Hedge budget exhausted; waiting for the first request")
+        return first.result()
+
+    logger.debug("Hedging request after %.3fs", delay)
+    pending: set[Future[T]] = {first, _HEDGE_POOL.submit(fn)}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            exc = fut.exception()
+            if exc is None:
+                return fut.result()
+            error = exc
+    assert error is not None
+    raise error
+
+
+def _is_failure(response: requests.Response) -> bool:
+    return response.status_code >= 500 or response.status_code == 429
+
+
+# Errors worth another attempt, mirroring urllib3's connect/read retries
+_RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+def resilient_get(
+    session: requests.Session,
+    url: str,
+    *,
+    timeout: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+    hedge: bool = False,
+    hedge_quantile: float = 0.95,
+    retries: int = 0,
+    backoff_factor: float = 0.5,
+    status_forcelist: Tuple[int, ...] = (500, 502, 503, 504),
+    **kwargs: Any,
+) -> requests.Response:
+    """``session.get`` guarded by the host's circuit breaker, hedging and *deadline*.
+
+    Retries happen here rather than in the session's transport adapter, so
+    every attempt re-checks the deadline and the breaker and counts as one
+    success or failure. The session should therefore not retry on its own.
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session performing the request.
+    url : str
+        Target URL.
+    timeout : float, optional
+        Per-attempt timeout, clamped to the deadline's remaining time.
+    deadline : Deadline, optional
+        Overall budget shared by all requests (and retries) of a search.
+    hedge : bool, default False
+        Send a duplicate request once the host's p95 latency has elapsed,
+        within the host's :class:`HedgeBudget`.
+    retries : int, default 0
+        Extra attempts after connection errors, timeouts or a status in
+        *status_forcelist*.
+    backoff_factor : float, default 0.5
+        Sleep ``backoff_factor * 2 ** n`` seconds before retry *n* (from 0);
+        no retry is made if the sleep would outlast the deadline.
+    status_forcelist : tuple of int
+        Response statuses that are retried.
+    **kwargs
+        Passed through to ``session.get``.
+
+    Raises
+    ------
+    CircuitOpenError
+        If the host's circuit is open.
+    DeadlineExceeded
+        If *deadline* is spent before or during a request.
+    """
+    host = _host(url)
+    breaker = breaker_for(url)
+    latency = latency_for(url)
+    hedge_budget = hedge_budget_for(url)
+
+    attempt = 0
+    while True:
+        attempt_timeout = timeout
+        if deadline is not None:
+            attempt_timeout = deadline.clamp(timeout)
+        breaker.before_call(host)
+
+        def _attempt() -> requests.Response:
+            start = time.monotonic()
+            response = session.get(url, timeout=attempt_timeout, **kwargs)
+            latency.record(time.monotonic() - start)
+            return response
+
+        try:
+            delay = latency.percentile(hedge_quantile) if hedge else None
+            with stage("fetch"):
+                hedge_budget.record_request()
+                if delay is not None:
+                    response = hedged(_attempt, delay, hedge_budget)
+                else:
+                    response = _attempt()
+        except requests.Timeout as exc:
+            # A timeout that fired because the deadline ran out says nothing about
+            # the host; one that fired with budget left does
+            if deadline is not None and deadline.expired:
+                breaker.release()
+                raise DeadlineExceeded(
+                    f"Deadline of {deadline.seconds:.1f}s exceeded fetching {url}"
+                ) from exc
+            breaker.record_failure()
+            if not _backoff(attempt, retries, backoff_factor, deadline):
+                raise
+        except _RETRYABLE_ERRORS:
+            breaker.record_failure()
+            if not _backoff(attempt, retries, backoff_factor, deadline):
+                raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        else:
+            if not _is_failure(response):
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if response.status_code not in status_forcelist or not _backoff(
+                attempt, retries, backoff_factor, deadline
+            ):
+                return response
+            response.close()
+        attempt += 1
+        logger.debug("Retrying %s (attempt %d of %d)", url, attempt + 1, retries + 1)
+
+
+def _backoff(
+    attempt: int, retries: int, backoff_factor: float, deadline: Optional[Deadline]
+) -> bool:
+    """Sleep before the next retry; return False when no retry should be made."""
+    if attempt >= retries:
+        return False
+    pause = backoff_factor * (2 ** attempt)
+    if deadline is not None and pause >= deadline.remaining():
+        return False
+    time.sleep(pause)
+    return True
@@ -2,14 +2,37 @@
 
 from __future__ import annotations
 
+from typing import Dict, Type
+
 from .base import JobBoardScraper
 from .indeed import IndeedScraper
 from .linkedin_api import LinkedInAPIScraper
 from .remoteok import RemoteOKScraper
 
+# Board identifiers accepted by config files and command-line options
+SCRAPERS: Dict[str, Type[JobBoardScraper]] = {
+    "indeed": IndeedScraper,
+    "linkedin": LinkedInAPIScraper,
+    "remoteok": RemoteOKScraper,
+}
+
+
+def get_scraper(board: str) -> JobBoardScraper:
+    """Instantiate the scraper registered under *board* (case-insensitive)."""
+    try:
+        scraper_cls = SCRAPERS[board.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown board {board!r}; expected one of {sorted(SCRAPERS)}"
+        ) from None
+    return scraper_cls()
+
+
 __all__: list[str] = [
     "JobBoardScraper",
     "IndeedScraper",
     "LinkedInAPIScraper",
     "RemoteOKScraper",
+    "SCRAPERS",
+    "get_scraper",
 ]
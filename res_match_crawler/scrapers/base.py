@@ -5,6 +5,9 @@ from __future__ import annotations
 import abc
 from typing import List
 
+import requests
+
+from res_match_crawler.http_helper import get_session
 from res_match_crawler.models import JobPosting
 
 
@@ -20,8 +23,22 @@ class JobBoardScraper(abc.ABC):
         location: str = "",
         *,
         limit: int = 20,
+        deadline: float | None = None,
     ) -> List[JobPosting]:
-        """Return up to *limit* job postings matching *keyword* and *location*."""
+        """Return up to *limit* job postings matching *keyword* and *location*.
+
+        *deadline* bounds the whole search in seconds. Once it is spent, no
+        further detail pages are fetched and the postings gathered so far are
+        returned.
+        """
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session this scraper fetches through, e.g. to attach an archive.
+
+        Defaults to the shared :func:`res_match_crawler.http_helper.get_session`.
+        """
+        return get_session()
 
     def __repr__(self) -> str:  # noqa: D401
         return f"<{self.__class__.__name__} name={self.name!r}>"
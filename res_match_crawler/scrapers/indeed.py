@@ -9,7 +9,10 @@ from typing import List
 from bs4 import BeautifulSoup
 
 from res_match_crawler.http_helper import get_html
+from res_match_crawler.extraction import parse_posted_date
 from res_match_crawler.models import JobPosting
+from res_match_crawler.profiling import scraper_stage, stage
+from res_match_crawler.resilience import Deadline
 from .base import JobBoardScraper
 
 logger = logging.getLogger(__name__)
@@ -22,12 +25,17 @@ class IndeedScraper(JobBoardScraper):
     BASE_URL: str = "https://www.indeed.com"
     SEARCH_PATH: str = "/jobs"
 
+    def __init__(self, *, hedge: bool = False) -> None:
+        self.hedge = hedge  # Hedge detail-page requests past the host's p95 latency
+
+    @scraper_stage("search")
     def search(
         self,
         keyword: str,
         location: str = "",
         *,
         limit: int = 20,
+        deadline: float | None = None,
     ) -> List[JobPosting]:
         """Search Indeed for *keyword* in *location* and return a list of JobPosting.
 
@@ -39,6 +47,9 @@ class IndeedScraper(JobBoardScraper):
             City, state or country. Empty string for worldwide.
         limit : int, default 20
             Maximum number of job postings to return.
+        deadline : float, optional
+            Overall time budget in seconds. Detail pages not fetched in time
+            leave the description empty.
         """
         params: dict[str, str] = {
             "q": keyword,
@@ -48,16 +59,20 @@ class IndeedScraper(JobBoardScraper):
         search_url = f"{self.BASE_URL}{self.SEARCH_PATH}"
         logger.info("Searching Indeed: %s", params)
 
-        html = get_html(search_url, params=params)
-        soup = BeautifulSoup(html, "lxml")
+        search_deadline = Deadline.after(deadline)
+        html = get_html(search_url, params=params, deadline=search_deadline)
+        with stage("parse"):
+            cards = BeautifulSoup(html, "lxml").select("a.tapItem")
 
         postings: list[JobPosting] = []
-        for card in soup.select("a.tapItem"):
+        for card in cards:
             if len(postings) >= limit:
                 break
 
             try:
-                job = self._parse_card(card, location_fallback=location)
+                job = self._parse_card(
+                    card, location_fallback=location, deadline=search_deadline
+                )
                 if job:
                     postings.append(job)
             except Exception as exc:  # noqa: BLE001
@@ -65,7 +80,9 @@ class IndeedScraper(JobBoardScraper):
 
         return postings
 
-    def _parse_card(self, card, *, location_fallback: str = "") -> JobPosting | None:  # type: ignore[valid-type]
+    def _parse_card(  # type: ignore[valid-type]
+        self, card, *, location_fallback: str = "", deadline: Deadline | None = None
+    ) -> JobPosting | None:
         """Convert a job card element to JobPosting (may fetch detail page)."""
         href = card.get("href")
         if not href:
@@ -73,35 +90,51 @@ class IndeedScraper(JobBoardScraper):
 
         detail_url = _urlparse.urljoin(self.BASE_URL, href)
 
-        title = card.select_one("h2.jobTitle span") or card.select_one("h2.jobTitle")
-        company = card.select_one("span.companyName")
-        loc_elem = card.select_one("div.companyLocation")
-
-        title_text = title.get_text(strip=True) if title else ""
-        company_text = company.get_text(strip=True) if company else ""
-        location_text = (
-            loc_elem.get_text(strip=True) if loc_elem else location_fallback or ""
-        )
+        with stage("parse"):
+            title = card.select_one("h2.jobTitle span") or card.select_one("h2.jobTitle")
+            company = card.select_one("span.companyName")
+            loc_elem = card.select_one("div.companyLocation")
+
+            title_text = title.get_text(strip=True) if title else ""
+            company_text = company.get_text(strip=True) if company else ""
+            location_text = (
+                loc_elem.get_text(strip=True) if loc_elem else location_fallback or ""
+            )
+            date_elem = card.select_one("span.date")
+            salary_elem = card.select_one("div.salary-snippet-container") or card.select_one(
+                ".salary-snippet"
+            )
+            posted_at = parse_posted_date(date_elem.get_text(" ", strip=True)) if date_elem else None
+            salary_text = salary_elem.get_text(" ", strip=True) if salary_elem else None
 
         # Fetch full description from detail page
-        description = self._fetch_description(detail_url)
-
-        return JobPosting(
-            title=title_text,
-            description=description,
-            location=location_text,
-            company=company_text,
-            url=detail_url,
-        )
-
-    def _fetch_description(self, url: str) -> str:
+        description = self._fetch_description(detail_url, deadline=deadline)
+
+        with stage("build"):
+            return JobPosting(
+                title=title_text,
+                description=description,
+                location=location_text,
+                company=company_text,
+                url=detail_url,
+                posted_at=posted_at,
+                salary=salary_text or None,
+            )
+
+    def _fetch_description(self, url: str, *, deadline: Deadline | None = None) -> str:
         """Return full job description text from the job detail page."""
         try:
-            html = get_html(url)
+            html = get_html(url, deadline=deadline, hedge=self.hedge)
         except Exception as exc:  # noqa: BLE001
             logger.debug("Failed to retrieve detail page %s: %s", url, exc)
             return ""
 
+        with stage("parse"):
+            return self.extract_description(html)
+
+    @staticmethod
+    def extract_description(html: str) -> str:
+        """Extract the job description text from an Indeed detail page."""
         soup = BeautifulSoup(html, "lxml")
         desc_elem = soup.select_one("div#jobDescriptionText") or soup.select_one(
             "div.jobsearch-jobDescriptionText"
@@ -7,11 +7,15 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import List
+from typing import Any, List
 
 import requests
 
+from res_match_crawler.extraction import parse_posted_date
 from res_match_crawler.models import JobPosting
+from res_match_crawler.profiling import scraper_stage, stage
+from res_match_crawler.resilience import Deadline, resilient_get
+from res_match_crawler.singleflight import request_key, shared
 from .base import JobBoardScraper
 
 logger = logging.getLogger(__name__)
@@ -37,12 +41,28 @@ class LinkedInAPIScraper(JobBoardScraper):
             }
         )
 
+    @property
+    def session(self) -> requests.Session:
+        """This scraper's own HTTP session (see :attr:`JobBoardScraper.session`)."""
+        return self._session
+
+    def _get_json(self, params: dict[str, str], deadline: Deadline | None = None) -> Any:
+        """Call the search endpoint and return the decoded JSON body."""
+        response = resilient_get(
+            self._session, self.API_ENDPOINT, params=params, timeout=30, deadline=deadline
+        )
+        response.raise_for_status()
+        with stage("parse"):
+            return response.json()
+
+    @scraper_stage("search")
     def search(
         self,
         keyword: str,
         location: str = "",
         *,
         limit: int = 20,
+        deadline: float | None = None,
     ) -> List[JobPosting]:
         params: dict[str, str] = {
             "keywords": keyword,  # RapidAPI uses 'keywords' not 'keyword'
@@ -52,9 +72,12 @@ class LinkedInAPIScraper(JobBoardScraper):
         logger.info("LinkedIn API search: %s", params)
 
         try:
-            response = self._session.get(self.API_ENDPOINT, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            search_deadline = Deadline.after(deadline)
+            data = shared(
+                request_key(self.API_ENDPOINT, params, namespace="linkedin-json"),
+                lambda: self._get_json(params, search_deadline),
+                search_deadline,
+            )
 
             logger.debug(
                 "API response keys: %s",
@@ -81,16 +104,25 @@ class LinkedInAPIScraper(JobBoardScraper):
                     item.get("description") or item.get("job_description") or ""
                 )
                 url = item.get("url") or item.get("job_url") or item.get("link") or ""
-
-                postings.append(
-                    JobPosting(
-                        title=title,
-                        description=description,
-                        location=location_text,
-                        company=company,
-                        url=url,
+                # The API sometimes returns structured values; only text is parsed
+                posted_text = item.get("posted_date") or item.get("date_posted")
+                posted_at = parse_posted_date(posted_text) if isinstance(posted_text, str) else None
+                salary = item.get("salary") or item.get("salary_range")
+                if not isinstance(salary, str):
+                    salary = None
+
+                with stage("build"):
+                    postings.append(
+                        JobPosting(
+                            title=title,
+                            description=description,
+                            location=location_text,
+                            company=company,
+                            url=url,
+                            posted_at=posted_at,
+                            salary=salary,
+                        )
                     )
-                )
 
             logger.info("Successfully parsed %d job postings", len(postings))
             return postings
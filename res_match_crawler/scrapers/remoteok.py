@@ -9,24 +9,39 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import List
+from typing import Any, List
 
 import requests
 from bs4 import BeautifulSoup
 
+from res_match_crawler.extraction import parse_posted_date
 from res_match_crawler.models import JobPosting
+from res_match_crawler.profiling import scraper_stage, stage
+from res_match_crawler.resilience import Deadline, resilient_get
+from res_match_crawler.singleflight import request_key, shared
 from .base import JobBoardScraper
 
 logger = logging.getLogger(__name__)
 
 
+def _format_salary(salary_min: Any, salary_max: Any) -> str | None:
+    """Render RemoteOK's numeric USD salary fields as raw salary text."""
+    amounts = [int(v) for v in (salary_min, salary_max) if isinstance(v, (int, float)) and v > 0]
+    if not amounts:
+        return None
+    if len(amounts) == 1 or amounts[0] == amounts[1]:
+        return f"${amounts[0]:,}"
+    return f"${amounts[0]:,} - ${amounts[1]:,}"
+
+
 class RemoteOKScraper(JobBoardScraper):
     """Fetch remote job postings from RemoteOK API."""
 
     name: str = "RemoteOK"
     API_ENDPOINT: str = "https://remoteok.io/api"
 
-    def __init__(self) -> None:
+    def __init__(self, *, hedge: bool = False) -> None:
+        self.hedge = hedge  # Hedge detail-page requests past the host's p95 latency
         self._session = requests.Session()
         # RemoteOK requires a User-Agent header
         self._session.headers.update(
@@ -35,54 +50,112 @@ class RemoteOKScraper(JobBoardScraper):
             }
         )
 
-    def _fetch_full_description(self, job_url: str) -> str:
-        """Fetch the full job description from the job detail page."""
-        try:
-            time.sleep(1)  # Be respectful to the server
-            response = self._session.get(job_url, timeout=30)
-            response.raise_for_status()
+    @property
+    def session(self) -> requests.Session:
+        """This scraper's own HTTP session (see :attr:`JobBoardScraper.session`)."""
+        return self._session
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Look for the job description in various possible selectors
-            desc_selectors = [
-                '.markdown',
-                '.job-description',
-                '.description',
-                '[data-description]',
-                '.content'
-            ]
-
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    # Clean up the text
-                    description = desc_elem.get_text(separator='\n', strip=True)
-                    if len(description) > 100:  # Make sure it's substantial
-                        return description
-
-            # Fallback: try to find any substantial text content
-            main_content = soup.select_one('main') or soup.select_one('body')
-            if main_content:
-                # Remove navigation, header, footer elements
-                for elem in main_content.select('nav, header, footer, .nav, .header, .footer'):
-                    elem.decompose()
-
-                text = main_content.get_text(separator='\n', strip=True)
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-
-                # Find substantial content (likely the job description)
-                substantial_lines = [line for line in lines if len(line) > 50]
-                if substantial_lines:
-                    return '\n'.join(substantial_lines[:20])  # Limit to first 20 substantial lines
-
-            logger.warning("Could not extract full description from %s", job_url)
-            return ""
+    def _fetch_full_description(self, job_url: str, deadline: Deadline | None = None) -> str:
+        """Fetch the full job description from the job detail page.
 
+        Concurrent requests for the same page (e.g. reached from two keyword
+        searches) share one fetch and one parsed description. Returns "" if
+        the page cannot be fetched within *deadline*.
+        """
+        key = request_key(
+            job_url, namespace="remoteok-description", options={"hedge": self.hedge}
+        )
+        try:
+            return shared(key, lambda: self._download_description(job_url, deadline), deadline)
         except Exception as e:
             logger.debug("Failed to fetch full description from %s: %s", job_url, e)
             return ""
 
+    def _fetch_feed(self, deadline: Deadline | None = None) -> Any:
+        """Fetch and decode the RemoteOK JSON feed, coalescing concurrent searches."""
+
+        def _download() -> Any:
+            # Add a small delay to be respectful to the API
+            self._pause(0.5, deadline)
+
+            response = resilient_get(
+                self._session, self.API_ENDPOINT, timeout=30, deadline=deadline
+            )
+            response.raise_for_status()
+            with stage("parse"):
+                return response.json()
+
+        key = request_key(self.API_ENDPOINT, namespace="remoteok-json")
+        return shared(key, _download, deadline)
+
+    def _download_description(self, job_url: str, deadline: Deadline | None = None) -> str:
+        """Download one detail page and extract its description."""
+        self._pause(1, deadline)  # Be respectful to the server
+        response = resilient_get(
+            self._session, job_url, timeout=30, deadline=deadline, hedge=self.hedge
+        )
+        response.raise_for_status()
+
+        with stage("parse"):
+            description = self.extract_description(response.text)
+        if not description:
+            logger.warning("Could not extract full description from %s", job_url)
+        return description
+
+    @staticmethod
+    def _pause(seconds: float, deadline: Deadline | None = None) -> None:
+        """Sleep between requests, counted as fetch time and cut short by *deadline*."""
+        with stage("fetch"):
+            time.sleep(seconds if deadline is None else min(seconds, deadline.remaining()))
+
+    @staticmethod
+    def _matches(job: dict[str, Any], keyword_lower: str) -> bool:
+        """Return True if *keyword_lower* occurs in the job's title, description or tags."""
+        title = job.get("position", "")
+        description = job.get("description", "")
+        tags = " ".join(job.get("tags", []))
+        return keyword_lower in f"{title} {description} {tags}".lower()
+
+    @staticmethod
+    def extract_description(html: str) -> str:
+        """Extract the job description text from a RemoteOK detail page."""
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Look for the job description in various possible selectors
+        desc_selectors = [
+            '.markdown',
+            '.job-description',
+            '.description',
+            '[data-description]',
+            '.content'
+        ]
+
+        for selector in desc_selectors:
+            desc_elem = soup.select_one(selector)
+            if desc_elem:
+                # Clean up the text
+                description = desc_elem.get_text(separator='\n', strip=True)
+                if len(description) > 100:  # Make sure it's substantial
+                    return description
+
+        # Fallback: try to find any substantial text content
+        main_content = soup.select_one('main') or soup.select_one('body')
+        if main_content:
+            # Remove navigation, header, footer elements
+            for elem in main_content.select('nav, header, footer, .nav, .header, .footer'):
+                elem.decompose()
+
+            text = main_content.get_text(separator='\n', strip=True)
+            lines = [line.strip() for line in text.split('\n') if line.strip()]
+
+            # Find substantial content (likely the job description)
+            substantial_lines = [line for line in lines if len(line) > 50]
+            if substantial_lines:
+                return '\n'.join(substantial_lines[:20])  # Limit to first 20 substantial lines
+
+        return ""
+
+    @scraper_stage("search")
     def search(
         self,
         keyword: str,
@@ -90,6 +163,7 @@ class RemoteOKScraper(JobBoardScraper):
         *,
         limit: int = 20,
         fetch_full_description: bool = True,
+        deadline: float | None = None,
     ) -> List[JobPosting]:
         """Search RemoteOK for remote jobs.
 
@@ -101,16 +175,14 @@ class RemoteOKScraper(JobBoardScraper):
             location: Ignored (all jobs are remote)
             limit: Maximum number of jobs to return
             fetch_full_description: If True, fetch full descriptions from job pages
+            deadline: Overall time budget in seconds; once spent, remaining
+                postings keep the short description from the API feed
         """
         logger.info("RemoteOK API search for keyword: %s", keyword)
 
+        search_deadline = Deadline.after(deadline)
         try:
-            # Add a small delay to be respectful to the API
-            time.sleep(0.5)
-
-            response = self._session.get(self.API_ENDPOINT, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = self._fetch_feed(search_deadline)
 
             # RemoteOK API returns a list where the first item is metadata
             # and the rest are job postings
@@ -125,19 +197,16 @@ class RemoteOKScraper(JobBoardScraper):
             postings: list[JobPosting] = []
             keyword_lower = keyword.lower()
 
-            for job in jobs_data:
+            # Filter by keyword in title, description, or tags
+            with stage("filter"):
+                matching = [job for job in jobs_data if self._matches(job, keyword_lower)]
+
+            for job in matching:
                 if len(postings) >= limit:
                     break
 
-                # Filter by keyword in title, description, or tags
                 title = job.get("position", "")
                 description = job.get("description", "")
-                tags = " ".join(job.get("tags", []))
-
-                # Check if keyword matches
-                search_text = f"{title} {description} {tags}".lower()
-                if keyword_lower not in search_text:
-                    continue
 
                 # Extract job information
                 company = job.get("company", "")
@@ -150,23 +219,30 @@ class RemoteOKScraper(JobBoardScraper):
                 if job.get("location"):
                     location_text = f"Remote ({job.get('location')})"
 
+                posted_at = parse_posted_date(job.get("date", ""))
+                salary = _format_salary(job.get("salary_min"), job.get("salary_max"))
+
                 # Fetch full description if requested
                 full_description = description
-                if fetch_full_description and url:
+                out_of_time = search_deadline is not None and search_deadline.expired
+                if fetch_full_description and url and not out_of_time:
                     logger.info("Fetching full description for: %s", title)
-                    full_desc = self._fetch_full_description(url)
+                    full_desc = self._fetch_full_description(url, search_deadline)
                     if full_desc:
                         full_description = full_desc
 
-                postings.append(
-                    JobPosting(
-                        title=title,
-                        description=full_description,
-                        location=location_text,
-                        company=company,
-                        url=url,
+                with stage("build"):
+                    postings.append(
+                        JobPosting(
+                            title=title,
+                            description=full_description,
+                            location=location_text,
+                            company=company,
+                            url=url,
+                            posted_at=posted_at,
+                            salary=salary,
+                        )
                     )
-                )
 
             logger.info("Successfully filtered %d matching job postings", len(postings))
             return postings
@@ -0,0 +1,211 @@
+"""In-flight request coalescing ("singleflight").
+
+When several threads ask for the same resource at the same time, only the
+first caller (the leader) performs the work; the others block until it
+finishes and receive the same result or exception. Nothing is cached once the
+call completes, so later callers trigger a fresh fetch.
+
+Errors that belong to the leader rather than the resource, such as running
+out of the leader's own deadline, are not shared: followers retry and one of
+them becomes the new leader. :func:`shared` applies this to HTTP fetches.
+
+Usage:
+    from res_match_crawler.singleflight import request_key, shared
+
+    key = request_key(url, params, options={"timeout": 10})
+    html = shared(key, lambda: fetch(url, params, deadline), deadline)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import urllib.parse as _urlparse
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type, TypeVar
+
+from res_match_crawler.resilience import Deadline, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    """Counters describing how much work coalescing saved."""
+
+    calls: int  # Total calls to :meth:`SingleFlight.do`
+    executions: int  # Calls that actually ran the function
+    saved: int  # Calls that shared another caller's in-flight result
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._n_calls = 0
+        self._n_executions = 0
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], T],
+        *,
+        timeout: Optional[float] = None,
+        retry_on: Tuple[Type[BaseException], ...] = (),
+    ) -> T:
+        """Run *fn* unless a call with *key* is already in flight, then share its outcome.
+
+        Parameters
+        ----------
+        key : str
+            Identifies equivalent calls.
+        fn : callable
+            The work; only the leader runs it.
+        timeout : float, optional
+            Longest a follower waits for the leader. :class:`TimeoutError` is
+            raised when it runs out.
+        retry_on : tuple of exception types
+            Leader errors that followers do not share. They try again instead,
+            joining the next flight or leading it.
+        """
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._n_calls += 1
+
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None:
+                    leader = False
+                else:
+                    call = self._calls[key] = _Call()
+                    self._n_executions += 1
+                    leader = True
+
+            if leader:
+                break
+
+            logger.debug("Coalesced request for %s", key)
+            wait = None if expires_at is None else max(0.0, expires_at - time.monotonic())
+            if not call.done.wait(wait):
+                raise TimeoutError(f"Timed out waiting for in-flight call {key}")
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, retry_on):
+                raise call.error
+            logger.debug("Leader of %s failed with %r; retrying", key, call.error)
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> SingleFlightStats:
+        """Return a snapshot of the coalescing counters."""
+        with self._lock:
+            return SingleFlightStats(
+                calls=self._n_calls,
+                executions=self._n_executions,
+                saved=self._n_calls - self._n_executions,
+            )
+
+    def reset_stats(self) -> None:
+        """Zero the counters (in-flight calls are unaffected)."""
+        with self._lock:
+            self._n_calls = 0
+            self._n_executions = 0
+
+
+def request_key(
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    *,
+    namespace: str = "",
+    options: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """Return a normalized key for a GET of *url* with *params*.
+
+    Scheme and host are lower-cased, default ports and fragments dropped, and
+    query parameters from the URL and *params* merged and sorted, so equivalent
+    requests map to the same key. *namespace* separates results decoded in
+    different ways (raw text vs parsed JSON) for the same URL. *options* are
+    request settings that can change the outcome, such as the timeout, so
+    callers only share fetches made on the same terms.
+    """
+    parts = _urlparse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = _urlparse.parse_qsl(parts.query, keep_blank_values=True)
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.extend((name, str(v)) for v in values)
+    query.sort()
+
+    key = _urlparse.urlunsplit(
+        (scheme, host, parts.path or "/", _urlparse.urlencode(query), "")
+    )
+    if headers:
+        key += "|" + "&".join(f"{k.lower()}={v}" for k, v in sorted(headers.items()))
+    if options:
+        key += "#" + "&".join(f"{k}={v}" for k, v in sorted(options.items()))
+    return f"{namespace}:{key}" if namespace else key
+
+
+# Process-wide group shared by http_helper and the scrapers
+_GROUP = SingleFlight()
+
+
+def default_group() -> SingleFlight:
+    """Return the process-wide :class:`SingleFlight` group."""
+    return _GROUP
+
+
+def shared(key: str, fn: Callable[[], T], deadline: Optional[Deadline] = None) -> T:
+    """Run *fn* through :func:`default_group` on behalf of a caller with *deadline*.
+
+    A follower waits no longer than its own *deadline*. If the leader runs
+    out of its deadline, followers do not inherit the resulting
+    :class:`DeadlineExceeded`; they retry within their own budget.
+
+    Raises
+    ------
+    DeadlineExceeded
+        If *deadline* is spent while waiting for another caller's fetch.
+    """
+    timeout = None if deadline is None else deadline.remaining()
+    try:
+        return _GROUP.do(key, fn, timeout=timeout, retry_on=(DeadlineExceeded,))
+    except TimeoutError as exc:
+        if deadline is None:
+            raise
+        raise DeadlineExceeded(
+            f"Deadline of {deadline.seconds:.1f}s exceeded waiting for {key}"
+        ) from exc
@@ -0,0 +1,276 @@
+"""Memory-bounded, de-duplicating buffer for crawl results.
+
+:class:`SpillBuffer` collects postings from many searches and drops
+duplicates by :attr:`JobPosting.dedup_key`. While its estimated footprint
+stays under ``memory_budget`` everything lives in memory. Once the budget is
+exceeded, the buffered postings, their de-duplication keys and insertion
+sequence numbers are sorted by key and written to a gzip-compressed
+JSON-lines segment on disk, and memory is released.
+
+Reading the results back is an external sort in two steps:
+
+1. segments are k-way merged by ``(key, seq)``, keeping the first-seen
+   posting per key, and the survivors are cut into budget-sized runs sorted
+   by ``seq``;
+2. the runs are k-way merged by ``seq``.
+
+Each merge opens at most ``max_fan_in`` files at once. When there are more,
+they are first merged in passes of ``max_fan_in`` into intermediate files,
+so open file handles and reader buffers stay bounded however large the
+crawl grows.
+
+Postings always come back in insertion order, whether or not a spill
+happened.
+
+Usage:
+    with SpillBuffer(memory_budget=parse_size("256M")) as buffer:
+        for keyword in keywords:
+            buffer.extend(scraper.search(keyword))
+        for posting in buffer:
+            write(posting)
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from res_match_crawler.models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+
+# Per-posting overhead beyond its strings: instance, dict entry and key
+_POSTING_OVERHEAD = 400
+
+# (dedup key, insertion sequence number, JobPosting.to_dict() record)
+_Entry = Tuple[str, int, Dict[str, Any]]
+
+
+def parse_size(text: str) -> int:
+    """Parse a human-readable size such as ``512M`` or ``1.5GiB`` into bytes."""
+    match = _SIZE_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid size {text!r}; expected e.g. 512M or 2G")
+    return int(float(match[1]) * _SIZE_UNITS[match[2].lower()])
+
+
+def _estimate_size(values: Iterable[Any]) -> int:
+    """Approximate in-memory size of a posting with string field *values*."""
+    size = _POSTING_OVERHEAD
+    for value in values:
+        if isinstance(value, str) and value:
+            size += sys.getsizeof(value)
+    return size
+
+
+def _from_record(record: Dict[str, Any]) -> JobPosting:
+    if record.get("posted_at"):
+        record["posted_at"] = _dt.date.fromisoformat(record["posted_at"])
+    return JobPosting(**record)
+
+
+def _by_key(entry: _Entry) -> Tuple[str, int]:
+    return entry[0], entry[1]
+
+
+def _by_seq(entry: _Entry) -> int:
+    return entry[1]
+
+
+class SpillBuffer:
+    """De-duplicating posting buffer that spills to disk past a memory budget.
+
+    Parameters
+    ----------
+    memory_budget : int, optional
+        Approximate bytes of postings to keep in memory. None never spills.
+    spill_dir : str, optional
+        Parent directory for segment files (default: the system temp dir).
+    max_fan_in : int, default 32
+        Most segment files merged at once while reading results back.
+    """
+
+    def __init__(
+        self,
+        memory_budget: Optional[int] = None,
+        *,
+        spill_dir: Optional[str] = None,
+        max_fan_in: int = 32,
+    ) -> None:
+        if max_fan_in < 2:
+            raise ValueError("max_fan_in must be at least 2")
+        self.memory_budget = memory_budget
+        self.max_fan_in = max_fan_in
+        self._spill_parent = spill_dir
+        self._tmpdir: Optional[str] = None
+        self._segments: List[str] = []
+        self._n_files = 0
+        # Insertion-ordered: key -> (sequence number, posting)
+        self._buffer: Dict[str, Tuple[int, JobPosting]] = {}
+        self._bytes = 0
+        self._seq = 0
+        self.added = 0  # Postings offered, duplicates included
+
+    @property
+    def spilled(self) -> bool:
+        """True once at least one segment has been written to disk."""
+        return bool(self._segments)
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Estimated size of the postings currently held in memory."""
+        return self._bytes
+
+    def add(self, posting: JobPosting) -> None:
+        """Buffer *posting* unless it duplicates one already buffered."""
+        self.added += 1
+        key = posting.dedup_key
+        if key in self._buffer:
+            return  # Duplicates of spilled postings are dropped during the merge
+        self._buffer[key] = (self._seq, posting)
+        self._seq += 1
+        self._bytes += _estimate_size(
+            (posting.title, posting.description, posting.location, posting.company,
+             posting.url, posting.salary)
+        )
+        if self.memory_budget is not None and self._bytes > self.memory_budget:
+            self._spill()
+
+    def extend(self, postings: Iterable[JobPosting]) -> None:
+        """Buffer every posting in *postings*."""
+        for posting in postings:
+            self.add(posting)
+
+    def _spill(self) -> None:
+        entries = (
+            (key, seq, posting.to_dict()) for key, (seq, posting) in sorted(self._buffer.items())
+        )
+        path = self._write_file(entries)
+        logger.info(
+            "Spilled %d postings (~%d KiB) to %s", len(self._buffer), self._bytes // 1024, path
+        )
+        self._segments.append(path)
+        self._buffer = {}
+        self._bytes = 0
+
+    def _write_file(self, entries: Iterable[_Entry]) -> str:
+        """Write *entries* (already sorted) to a new compressed file and return its path."""
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.mkdtemp(prefix="res-match-spill-", dir=self._spill_parent)
+        path = os.path.join(self._tmpdir, f"segment-{self._n_files:05d}.jsonl.gz")
+        self._n_files += 1
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=1) as fh:
+            for entry in entries:
+                fh.write(json.dumps(entry, ensure_ascii=False))
+                fh.write("\n")
+        return path
+
+    @staticmethod
+    def _read_file(path: str) -> Iterator[_Entry]:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                key, seq, record = json.loads(line)
+                yield key, seq, record
+
+    def _merge(
+        self, paths: List[str], order: Callable[[_Entry], Any], keep: Iterable[str] = ()
+    ) -> Iterator[_Entry]:
+        """k-way merge sorted files by *order*, opening at most ``max_fan_in`` at once.
+
+        Files not in *keep* are deleted once merged.
+        """
+        keep = set(keep)
+        intermediates: List[str] = []
+        try:
+            while len(paths) > self.max_fan_in:
+                merged: List[str] = []
+                for i in range(0, len(paths), self.max_fan_in):
+                    group = paths[i:i + self.max_fan_in]
+                    if len(group) == 1:
+                        merged.append(group[0])
+                        continue
+                    streams = [self._read_file(path) for path in group]
+                    path = self._write_file(heapq.merge(*streams, key=order))
+                    intermediates.append(path)
+                    merged.append(path)
+                    for done in group:
+                        if done not in keep:
+                            os.remove(done)
+                logger.debug("Merge pass reduced %d files to %d", len(paths), len(merged))
+                paths = merged
+            yield from heapq.merge(*(self._read_file(path) for path in paths), key=order)
+        finally:
+            for path in paths + intermediates:
+                if path not in keep and os.path.exists(path):
+                    os.remove(path)
+
+    def __iter__(self) -> Iterator[JobPosting]:
+        """Yield unique postings in insertion order."""
+        if not self._segments:
+            for _, posting in self._buffer.values():
+                yield posting
+            return
+
+        # Put everything on disk so the budget is free for building runs
+        if self._buffer:
+            self._spill()
+
+        runs: List[str] = []
+        run: List[_Entry] = []
+        run_bytes = 0
+        last_key = None
+        try:
+            # Step 1: de-duplicate by key, cut survivors into runs sorted by seq
+            for entry in self._merge(self._segments, _by_key, keep=self._segments):
+                if entry[0] == last_key:
+                    continue  # Sorted by (key, seq): the first entry per key is the earliest
+                last_key = entry[0]
+                run.append(entry)
+                run_bytes += _estimate_size(entry[2].values())
+                if self.memory_budget is not None and run_bytes > self.memory_budget:
+                    run.sort(key=_by_seq)
+                    runs.append(self._write_file(run))
+                    run, run_bytes = [], 0
+            run.sort(key=_by_seq)
+
+            # Step 2: merge the runs back into insertion order
+            if runs:
+                if run:
+                    runs.append(self._write_file(run))
+                    run = []
+                entries: Iterable[_Entry] = self._merge(runs, _by_seq)
+            else:
+                entries = run
+            for _, _, record in entries:
+                yield _from_record(record)
+        finally:
+            for path in runs:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def close(self) -> None:
+        """Delete spilled segments and drop buffered postings."""
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+        self._segments = []
+        self._buffer = {}
+        self._bytes = 0
+
+    def __enter__(self) -> "SpillBuffer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
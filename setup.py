@@ -13,6 +13,7 @@ setup(
     ],
     extras_require={
         "dev": ["pytest>=7.4.0"],
+        "archive": ["zstandard>=0.21.0"],
     },
     python_requires=">=3.8",
 )
@@ -0,0 +1,18 @@
+"""Test data shared across the unit tests."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from res_match_crawler.models import JobPosting
+
+
+def make_posting(n: int, title: str = "Python dev", description: str = "", **fields: Any) -> JobPosting:
+    """Return posting *n* (URL ``https://example.com/<n>``); *fields* override the rest."""
+    values: dict[str, Any] = {
+        "location": "Remote",
+        "company": "Acme",
+        "url": f"https://example.com/{n}",
+    }
+    values.update(fields)
+    return JobPosting(title=title, description=description, **values)
@@ -0,0 +1,87 @@
+"""Unit tests for the raw-page archive and re-extraction."""
+
+from __future__ import annotations
+
+import pytest
+import requests
+
+from res_match_crawler.archive import ArchivedPage, ArchiveReader, ArchiveWriter, reextract
+from res_match_crawler.daemon import CrawlDaemon
+from res_match_crawler.scrapers import RemoteOKScraper
+
+REMOTEOK_HTML = (
+    "<html><body><div class='markdown'>"
+    + "We are hiring a senior Python engineer to build data pipelines. " * 3
+    + "</div></body></html>"
+)
+
+INDEED_HTML = """
+<html><body>
+<div id="jobDescriptionText"><p>Great Python position building APIs.</p></div>
+</body></html>
+"""
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    root = tmp_path / "pages"
+    # Tiny segments force several segment files
+    with ArchiveWriter(str(root), codec="gzip", segment_size=200) as writer:
+        writer.append("https://remoteok.io/api", b"[{}]", headers={"Content-Type": "application/json"})
+        writer.append("https://remoteok.io/remote-jobs/1", REMOTEOK_HTML.encode())
+        writer.append("https://www.indeed.com/rc/clk?jk=123", INDEED_HTML.encode())
+        writer.append("https://www.indeed.com/rc/clk?jk=404", b"gone", status=404)
+    return str(root)
+
+
+def test_random_access_read(archive_dir) -> None:
+    """Entries point at independently decodable frames across segments."""
+    reader = ArchiveReader(archive_dir)
+    entries = list(reader.entries())
+
+    assert len(entries) == 4
+    assert len({e.segment for e in entries}) > 1
+
+    page = reader.read(entries[2])
+    assert page.url == "https://www.indeed.com/rc/clk?jk=123"
+    assert "Great Python position" in page.text
+
+
+def test_charset_header_is_case_insensitive() -> None:
+    body = "Café".encode("latin-1")
+    page = ArchivedPage("https://example.com", 200, {"CONTENT-TYPE": "text/html; charset=latin-1"}, 0.0, body)
+    assert page.text == "Café"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reextract_detail_pages(archive_dir, workers) -> None:
+    """Only successful detail pages are re-parsed with the scraper selectors."""
+    results = {r["url"]: r["description"] for r in reextract(archive_dir, workers=workers, batch_size=1)}
+
+    assert set(results) == {
+        "https://remoteok.io/remote-jobs/1",
+        "https://www.indeed.com/rc/clk?jk=123",
+    }
+    assert results["https://www.indeed.com/rc/clk?jk=123"] == "Great Python position building APIs."
+    assert results["https://remoteok.io/remote-jobs/1"].startswith("We are hiring")
+
+
+def test_daemon_archives_scraper_sessions(tmp_path) -> None:
+    """The daemon attaches its archive to every scraper's public session."""
+    scraper = RemoteOKScraper()
+    writer = ArchiveWriter(str(tmp_path / "pages"), codec="gzip")
+    daemon = CrawlDaemon([], lambda posting: None, scraper_factory=lambda board: scraper, archive=writer)
+    assert daemon._scraper("remoteok") is scraper
+    writer.attach(scraper.session)  # Attaching twice is harmless
+
+    response = requests.Response()
+    response.url = "https://remoteok.io/remote-jobs/1"
+    response.status_code = 200
+    response._content = REMOTEOK_HTML.encode()
+    for hook in scraper.session.hooks["response"]:
+        hook(response)
+    writer.close()
+
+    assert writer.record_response not in scraper.session.hooks["response"]
+    entries = list(ArchiveReader(str(tmp_path / "pages")).entries())
+    assert [e.url for e in entries] == ["https://remoteok.io/remote-jobs/1"]
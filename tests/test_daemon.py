@@ -0,0 +1,223 @@
+"""Unit tests for CrawlDaemon.
+
+Scrapers are replaced with in-memory fakes so tests run offline.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import List
+
+from res_match_crawler.daemon import CrawlDaemon, Schedule
+from res_match_crawler.models import JobPosting
+from res_match_crawler.scrapers import JobBoardScraper
+
+
+class SlowScraper(JobBoardScraper):
+    """Take *delay* seconds per search and record peak concurrency per board."""
+
+    def __init__(self, board: str, tracker: dict, delay: float = 0.1) -> None:
+        self.name = board
+        self.tracker = tracker
+        self.delay = delay
+
+    def search(self, keyword, location="", *, limit=20, deadline=None) -> List[JobPosting]:
+        with self.tracker["lock"]:
+            self.tracker["active"][self.name] += 1
+            self.tracker["peak"][self.name] = max(
+                self.tracker["peak"][self.name], self.tracker["active"][self.name]
+            )
+            self.tracker["calls"] += 1
+        time.sleep(self.delay)
+        with self.tracker["lock"]:
+            self.tracker["active"][self.name] -= 1
+        return [
+            JobPosting(
+                title=keyword,
+                description="",
+                location="Remote",
+                company=self.name,
+                url=f"https://{self.name}.example.com/{keyword}/{i}",
+            )
+            for i in range(3)
+        ]
+
+
+def _tracker() -> dict:
+    return {
+        "lock": threading.Lock(),
+        "active": {"a": 0, "b": 0},
+        "peak": {"a": 0, "b": 0},
+        "calls": 0,
+    }
+
+
+class FakeScraper(JobBoardScraper):
+    """Return the same postings for every search and count calls."""
+
+    name = "fake"
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.deadlines: List[object] = []
+
+    def search(self, keyword, location="", *, limit=20, deadline=None) -> List[JobPosting]:
+        self.calls += 1
+        self.deadlines.append(deadline)
+        return [
+            JobPosting(
+                title=f"{keyword} dev {i}",
+                description="",
+                location="Remote",
+                company="Acme",
+                url=f"https://example.com/{i}",
+            )
+            for i in range(3)
+        ]
+
+
+def _run_until(daemon: CrawlDaemon, predicate, timeout: float = 5.0) -> None:
+    thread = threading.Thread(target=daemon.run)
+    thread.start()
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    daemon.stop()
+    thread.join(timeout)
+    assert not thread.is_alive()
+
+
+def test_daemon_dedups_and_checkpoints(tmp_path) -> None:
+    """Overlapping schedules emit each URL once and survive a restart."""
+    checkpoint = tmp_path / "state.json"
+    scraper = FakeScraper()
+    received: List[JobPosting] = []
+    schedules = [
+        Schedule(board="fake", keyword="python", interval=3600, jitter=0),
+        Schedule(board="fake", keyword="django", interval=3600, jitter=0),
+    ]
+
+    daemon = CrawlDaemon(
+        schedules,
+        received.append,
+        checkpoint_path=str(checkpoint),
+        checkpoint_interval=0,
+        scraper_factory=lambda board: scraper,
+    )
+
+    def both_completed() -> bool:
+        if not checkpoint.exists():
+            return False
+        return len(json.loads(checkpoint.read_text())["last_run"]) == 2
+
+    _run_until(daemon, both_completed)
+
+    assert scraper.calls == 2
+    assert sorted(p.url for p in received) == [f"https://example.com/{i}" for i in range(3)]
+
+    # Restart: both schedules completed recently, so nothing is due yet
+    restarted = CrawlDaemon(
+        schedules,
+        received.append,
+        checkpoint_path=str(checkpoint),
+        scraper_factory=lambda board: scraper,
+    )
+    _run_until(restarted, lambda: False, timeout=0.3)
+    assert scraper.calls == 2
+    assert len(received) == 3
+
+
+def test_schedule_deadline_reaches_search() -> None:
+    """A configured deadline bounds each run of its schedule."""
+    scraper = FakeScraper()
+    schedule = Schedule.from_dict({"board": "fake", "keyword": "python", "jitter": 0, "deadline": 45})
+    assert Schedule.from_dict({"board": "fake", "keyword": "python"}).deadline is None
+
+    daemon = CrawlDaemon([schedule], lambda posting: None, scraper_factory=lambda board: scraper)
+    _run_until(daemon, lambda: scraper.calls == 1)
+
+    assert scraper.deadlines == [45.0]
+
+
+def test_per_board_cap(tmp_path) -> None:
+    """A busy board never exceeds max_per_board, and other boards still run."""
+    tracker = _tracker()
+    scrapers = {board: SlowScraper(board, tracker) for board in ("a", "b")}
+    schedules = [Schedule(board="a", keyword=f"k{i}", interval=3600, jitter=0) for i in range(6)]
+    schedules.append(Schedule(board="b", keyword="k", interval=3600, jitter=0))
+
+    daemon = CrawlDaemon(
+        schedules,
+        lambda posting: None,
+        max_in_flight=4,
+        max_per_board=2,
+        scraper_factory=lambda board: scrapers[board],
+    )
+    _run_until(daemon, lambda: tracker["calls"] == 7)
+
+    assert tracker["calls"] == 7
+    assert tracker["peak"]["a"] == 2
+    assert tracker["peak"]["b"] == 1
+
+
+def test_slow_sink_pauses_producers() -> None:
+    """While the sink is stuck, no new searches start; they resume once it drains."""
+    tracker = _tracker()
+    scraper = SlowScraper("a", tracker, delay=0.0)
+    release = threading.Event()
+    received: List[JobPosting] = []
+
+    def slow_sink(posting: JobPosting) -> None:
+        release.wait(timeout=5)
+        received.append(posting)
+
+    schedules = [Schedule(board="a", keyword=f"k{i}", interval=3600, jitter=0) for i in range(10)]
+    daemon = CrawlDaemon(
+        schedules,
+        slow_sink,
+        max_in_flight=2,
+        max_per_board=2,
+        sink_queue_size=5,
+        scraper_factory=lambda board: scraper,
+    )
+    thread = threading.Thread(target=daemon.run)
+    thread.start()
+    try:
+        time.sleep(0.5)
+        paused_calls = tracker["calls"]
+        # One search's postings fill the queue; at most max_in_flight more got in first
+        assert paused_calls <= 3
+        time.sleep(0.3)
+        assert tracker["calls"] == paused_calls
+
+        release.set()
+        deadline = time.time() + 5
+        while len(received) < 30 and time.time() < deadline:
+            time.sleep(0.01)
+        assert tracker["calls"] == 10
+        assert len(received) == 30
+    finally:
+        release.set()
+        daemon.stop()
+        thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_shutdown_does_not_hang_when_sink_died(monkeypatch) -> None:
+    """If the sink thread has died with the queue full, run() still returns."""
+    tracker = _tracker()
+    scraper = SlowScraper("a", tracker, delay=0.0)
+    daemon = CrawlDaemon(
+        [Schedule(board="a", keyword=f"k{i}", interval=3600, jitter=0) for i in range(3)],
+        lambda posting: None,
+        sink_queue_size=2,
+        scraper_factory=lambda board: scraper,
+    )
+
+    def dead_sink() -> None:
+        daemon._sink_alive = False
+
+    monkeypatch.setattr(daemon, "_drain_sink", dead_sink)
+    _run_until(daemon, lambda: daemon._queue.full())
@@ -0,0 +1,95 @@
+"""Unit tests for structured extraction and the facet index."""
+
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+
+from res_match_crawler.extraction import (
+    extract_batch,
+    normalize_location,
+    parse_posted_date,
+    parse_salary,
+)
+from res_match_crawler.facets import FacetIndex
+from res_match_crawler.scrapers import LinkedInAPIScraper
+
+from .factories import make_posting
+
+TODAY = dt.date(2024, 5, 10)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("$120k - $150k", (120_000, 150_000, "USD")),
+        ("€60.000 to €75.000 a year", (60_000, 75_000, "EUR")),
+        ("£45/hour", (93_600, 93_600, "GBP")),
+        ("We raised $5 million", (None, None, None)),
+    ],
+)
+def test_parse_salary(text, expected) -> None:
+    assert parse_salary(text)[:3] == expected
+
+
+def test_parse_dates_and_locations() -> None:
+    assert parse_posted_date("2024-05-01T12:00:00+00:00") == dt.date(2024, 5, 1)
+    assert parse_posted_date("Posted 30+ days ago", TODAY) == dt.date(2024, 4, 10)
+    assert parse_posted_date("Just posted", TODAY) == TODAY
+    assert normalize_location("Remote (Europe)") == {"remote", "europe"}
+    assert normalize_location("Austin, TX") == {"united states", "north america"}
+    assert normalize_location("Wilmington, DE") == {"united states", "north america"}
+    assert normalize_location("Munich, DE") == {"germany", "europe"}
+    assert normalize_location("Toronto, CA") == {"canada", "north america"}
+    assert normalize_location("Berlin, Germany") == {"germany", "europe"}
+    assert normalize_location("Remote (South America)") == {"remote", "latin america"}
+    assert normalize_location("Central America") == {"latin america"}
+    assert normalize_location("America") == {"united states", "north america"}
+
+
+def test_facet_query_combines_filters() -> None:
+    """remote OR Europe, salary >= 100k, posted in the last 7 days."""
+    postings = [
+        make_posting(0, description="Posted 2 days ago", salary="$120k - $150k"),
+        make_posting(1, description="Posted yesterday", salary="€90,000 - €110,000", location="Berlin, Germany"),
+        make_posting(2, description="Posted today", salary="$80k", location="Remote (Europe)"),  # Salary too low
+        make_posting(3, description="Posted today", salary="$200k", location="Austin, TX"),  # Wrong location
+        make_posting(4, description="Posted 30+ days ago", salary="$130k"),  # Too old
+        make_posting(5),  # No salary or date
+    ]
+    fields = extract_batch(postings, TODAY)
+    index = FacetIndex(postings, fields)
+
+    hits = index.query(
+        locations=["remote", "Europe"],
+        min_salary=100_000,
+        currency="USD",
+        posted_within_days=7,
+        today=TODAY,
+    )
+    assert [p.url for p in hits] == ["https://example.com/0"]
+    hits = index.query(locations=["Europe"], min_salary=100_000, currency="eur")
+    assert [p.url for p in hits] == ["https://example.com/1"]
+
+    assert index.count(locations=["Germany"]) == 1
+    assert index.count(locations=["remote"]) == 4
+    assert index.count(max_salary=100_000) == 2
+    assert index.count() == 6
+    assert index.currencies == {"USD": 4, "EUR": 1}
+    assert index.count(currency="GBP") == 0
+
+
+def test_linkedin_ignores_non_text_date_and_salary(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Structured API values are dropped rather than stored as text."""
+    items = [
+        {"title": "A", "url": "https://example.com/a", "posted_date": "2024-05-01", "salary": "$120k"},
+        {"title": "B", "url": "https://example.com/b", "posted_date": 1714521600, "salary": {"min": 1}},
+    ]
+    scraper = LinkedInAPIScraper(api_key="test")
+    monkeypatch.setattr(scraper, "_get_json", lambda params, deadline=None: {"data": items})
+
+    first, second = scraper.search("python")
+
+    assert (first.posted_at, first.salary) == (dt.date(2024, 5, 1), "$120k")
+    assert (second.posted_at, second.salary) == (None, None)
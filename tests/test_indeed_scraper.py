@@ -5,6 +5,8 @@ Network calls are stubbed via monkeypatch so tests run offline.
 
 from __future__ import annotations
 
+import json
+
 import pytest
 from unittest.mock import Mock
 
@@ -17,6 +19,7 @@ SEARCH_HTML = """
   <h2 class="jobTitle"><span>Python Developer</span></h2>
   <span class="companyName">Acme Corp</span>
   <div class="companyLocation">Remote</div>
+  <span class="date">Posted 3 days ago</span>
 </a>
 <a class="tapItem" href="/rc/clk?jk=456">
   <h2 class="jobTitle"><span>Backend Engineer</span></h2>
@@ -65,3 +68,5 @@ def test_search_parses_results(monkeypatch: pytest.MonkeyPatch) -> None:
     assert first.location == "Remote"
     assert "Python position" in first.description
     assert first.url == "https://www.indeed.com/rc/clk?jk=123"
+    assert first.posted_at is not None
+    assert json.loads(json.dumps(first.to_dict()))["posted_at"] == first.posted_at.isoformat()
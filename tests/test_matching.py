@@ -0,0 +1,63 @@
+"""Unit tests for incremental top-k matching."""
+
+from __future__ import annotations
+
+from typing import List
+
+from res_match_crawler.matching import RankingChange, StandingQueryMatcher, vectorize
+
+from .factories import make_posting
+
+
+def test_vectorize_is_normalised() -> None:
+    vector = vectorize("Python python Django and the APIs")
+    assert "the" not in vector
+    assert abs(sum(w * w for w in vector.values()) - 1.0) < 1e-9
+    assert vector["python"] > vector["django"]
+
+
+def test_topk_updates_incrementally_and_notifies() -> None:
+    """Only new postings are scored; better ones evict the weakest match."""
+    matcher = StandingQueryMatcher(default_k=2)
+    matcher.register("py", "Senior Python engineer, Django, PostgreSQL, AWS")
+    matcher.register("fe", "Frontend developer React TypeScript CSS")
+    changes: List[RankingChange] = []
+    matcher.subscribe(changes.append)
+
+    matcher.add_postings(
+        [
+            make_posting(1, "Python Django developer", "Build APIs"),
+            make_posting(2, "Java engineer", "Spring"),
+            make_posting(3, "React developer", "TypeScript frontend"),
+        ]
+    )
+    assert [m.posting.url for m in matcher.top("py")] == [
+        "https://example.com/1",
+        "https://example.com/2",
+    ]
+    assert {c.resume_id for c in changes} == {"py", "fe"}
+
+    changes.clear()
+    strong = make_posting(4, "Senior Python engineer", "Django PostgreSQL AWS")
+    result = matcher.add_postings([strong, make_posting(1, "Python Django developer", "Build APIs")])
+
+    assert result == changes
+    (change,) = [c for c in changes if c.resume_id == "py"]
+    assert [m.posting for m in change.entered] == [strong]
+    assert [m.posting.url for m in change.evicted] == ["https://example.com/2"]
+    assert change.top[0].posting is strong
+    assert all(c.resume_id != "fe" for c in changes)
+
+
+def test_transient_entries_are_not_reported_as_evicted() -> None:
+    """A posting that enters and leaves within one batch is neither entered nor evicted."""
+    matcher = StandingQueryMatcher(default_k=1)
+    matcher.register("py", "Python Django PostgreSQL AWS Docker")
+    matcher.add_postings([make_posting(0, "Python")])
+
+    better = make_posting(1, "Python Django")
+    best = make_posting(2, "Python Django PostgreSQL AWS")
+    (change,) = matcher.add_postings([better, best])
+
+    assert [m.posting for m in change.entered] == [best]
+    assert [m.posting.url for m in change.evicted] == ["https://example.com/0"]
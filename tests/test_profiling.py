@@ -0,0 +1,99 @@
+"""Unit tests for crawl profiling."""
+
+from __future__ import annotations
+
+import pstats
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from res_match_crawler import http_helper, profiling
+from res_match_crawler.profiling import profile_crawl, stage
+from res_match_crawler.resilience import Deadline
+from res_match_crawler.scrapers import IndeedScraper, RemoteOKScraper
+
+from .test_indeed_scraper import DETAIL_HTML, SEARCH_HTML
+
+
+def test_stage_is_noop_without_profiler() -> None:
+    """Stages outside a profiling run share one null context manager."""
+    assert stage("fetch") is stage("parse")
+
+
+def test_profile_crawl_records_stages(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A profiled search reports labelled stages and writes pstats and stacks."""
+
+    def mock_session_get(url, **kwargs):
+        time.sleep(0.02)  # Long enough for the sampler to see the fetch
+        response = Mock()
+        response.status_code = 200
+        response.raise_for_status.return_value = None
+        response.text = SEARCH_HTML if "/jobs" in url else DETAIL_HTML
+        return response
+
+    monkeypatch.setattr(http_helper._SESSION, "get", mock_session_get)
+
+    with profile_crawl(str(tmp_path), sample_interval=0.002) as profiler:
+        IndeedScraper().search("python", limit=2)
+
+    assert profiling._ACTIVE is None
+    labels = set(profiler.stats)
+    assert {("Indeed", s) for s in ("search", "fetch", "parse", "build")} <= labels
+    assert profiler.stats[("Indeed", "fetch")].calls == 3
+    # Exclusive times: fetch dominates, and nothing is double counted
+    total = sum(s.wall for s in profiler.stats.values())
+    assert profiler.stats[("Indeed", "fetch")].wall >= 0.06
+    assert total <= profiler.wall + 0.01
+
+    assert pstats.Stats(str(tmp_path / "crawl.pstats")).total_calls > 0
+    collapsed = (tmp_path / "crawl.collapsed").read_text()
+    assert "Indeed:search;Indeed:fetch;" in collapsed
+    assert (tmp_path / "stages.json").exists()
+
+
+def test_remoteok_filter_is_one_stage_per_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The keyword filter over the feed is timed as a single stage."""
+    feed = [{"legal": "..."}] + [
+        {"position": f"Job {i}", "description": "python" if i % 2 else "", "url": f"https://remoteok.io/{i}"}
+        for i in range(50)
+    ]
+    scraper = RemoteOKScraper()
+    monkeypatch.setattr(scraper, "_fetch_feed", lambda deadline=None: feed)
+
+    with profile_crawl() as profiler:
+        jobs = scraper.search("python", limit=5, fetch_full_description=False)
+
+    assert len(jobs) == 5
+    assert profiler.stats[("RemoteOK", "search")].calls == 1
+    assert profiler.stats[("RemoteOK", "filter")].calls == 1
+    assert profiler.stats[("RemoteOK", "build")].calls == 5
+
+
+def test_remoteok_politeness_pause_is_fetch_time_within_deadline() -> None:
+    """The pause between requests counts as fetch time and never outlasts the deadline."""
+    with profile_crawl() as profiler, stage("search", scraper="RemoteOK"):
+        start = time.monotonic()
+        RemoteOKScraper._pause(1, Deadline.after(0.05))
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.5
+    assert profiler.stats[("RemoteOK", "fetch")].calls == 1
+
+
+def test_sampler_skips_threads_outside_stages() -> None:
+    """Idle threads are not sampled; only work inside a stage shows up."""
+    idle = threading.Event()
+    waiter = threading.Thread(target=idle.wait, args=(5,))
+    waiter.start()
+    try:
+        with profile_crawl(sample_interval=0.002, cprofile=False) as profiler:
+            with stage("fetch", scraper="X"):
+                time.sleep(0.1)
+    finally:
+        idle.set()
+        waiter.join()
+
+    assert profiler.samples
+    assert all(key.startswith("X:fetch;") for key in profiler.samples)
@@ -0,0 +1,209 @@
+"""Unit tests for circuit breakers, hedged requests and deadlines."""
+
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from res_match_crawler import http_helper, resilience
+from res_match_crawler.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceeded,
+    HedgeBudget,
+    hedged,
+    resilient_get,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    resilience.reset()
+    yield
+    resilience.reset()
+
+
+def _response(status: int = 200) -> Mock:
+    response = Mock()
+    response.status_code = status
+    return response
+
+
+def test_breaker_fails_fast_then_recovers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Five 503s open the circuit; after the recovery timeout one probe closes it."""
+    session = Mock()
+    session.get.return_value = _response(503)
+    for _ in range(5):
+        resilient_get(session, "https://slow.example.com/a")
+    assert session.get.call_count == 5
+
+    with pytest.raises(CircuitOpenError):
+        resilient_get(session, "https://slow.example.com/b")
+    assert session.get.call_count == 5  # Rejected without touching the network
+
+    breaker = resilience.breaker_for("https://slow.example.com/")
+    monkeypatch.setattr(breaker, "recovery_timeout", 0.0)
+    session.get.return_value = _response(200)
+    resilient_get(session, "https://slow.example.com/c")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_probe() -> None:
+    """While a probe is in flight, other callers are still rejected."""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+    breaker.record_failure()
+
+    breaker.before_call()  # The probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_hedged_returns_fastest_result() -> None:
+    """A stalled first attempt is overtaken by the hedge."""
+    calls = []
+    stall = threading.Event()
+
+    def fetch() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            stall.wait(timeout=5)
+            return "slow"
+        return "fast"
+
+    start = time.monotonic()
+    assert hedged(fetch, delay=0.05) == "fast"
+    assert time.monotonic() - start < 1
+    stall.set()
+
+
+def test_hedge_budget_caps_hedges() -> None:
+    """Without budget tokens the slow first attempt is awaited, not duplicated."""
+    budget = HedgeBudget(ratio=0.5, burst=1.0)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_spend()
+
+    calls = []
+
+    def fetch() -> str:
+        calls.append(1)
+        time.sleep(0.1)
+        return "slow"
+
+    assert hedged(fetch, delay=0.01, budget=budget) == "slow"
+    assert len(calls) == 1
+
+
+def test_hedge_delay_excludes_time_queued(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Waiting for a busy pool worker is not mistaken for a slow request."""
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(resilience, "_HEDGE_POOL", pool)
+    pool.submit(time.sleep, 0.2)  # Occupy the only worker
+    calls = []
+
+    def fetch() -> str:
+        calls.append(1)
+        time.sleep(0.02)
+        return "ok"
+
+    assert hedged(fetch, delay=0.1) == "ok"
+    assert len(calls) == 1
+    pool.shutdown()
+
+
+def test_deadline_clamps_and_expires() -> None:
+    """Timeouts shrink to the remaining budget and fail once it is spent."""
+    deadline = Deadline(0.5)
+    assert deadline.clamp(30) <= 0.5
+
+    session = Mock()
+    with pytest.raises(DeadlineExceeded):
+        resilient_get(session, "https://example.com", timeout=10, deadline=Deadline(0))
+    session.get.assert_not_called()
+    assert issubclass(DeadlineExceeded, requests.Timeout)
+
+
+@pytest.fixture
+def hanging_server():
+    """Local HTTP server whose responses stall until the test finishes."""
+    release = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            release.wait(timeout=10)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args) -> None:  # Keep pytest output quiet
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/slow"
+    release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_deadline_bounds_total_time_including_retries(hanging_server: str) -> None:
+    """Retries never outlast the deadline, and clamped timeouts spare the breaker."""
+    start = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        http_helper.get_html(hanging_server, timeout=0.2, deadline=Deadline(1.0))
+    assert time.monotonic() - start < 1.5
+    # Two 0.2s attempts fit (with a 0.5s backoff); the next backoff would not
+    breaker = resilience.breaker_for(hanging_server)
+    assert breaker._failures == 2
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        http_helper.get_html(hanging_server, deadline=Deadline(0.3))
+    assert time.monotonic() - start < 0.8
+
+
+def test_clamped_timeouts_do_not_open_circuit(hanging_server: str) -> None:
+    """Searches that run out of budget leave a healthy host's circuit closed."""
+    for _ in range(8):
+        with pytest.raises(DeadlineExceeded):
+            resilient_get(requests.Session(), hanging_server, timeout=10, deadline=Deadline(0.05))
+    assert resilience.breaker_for(hanging_server).state == CircuitBreaker.CLOSED
+
+
+def test_each_retry_counts_as_a_failure() -> None:
+    """One call with retries records every failed attempt on the breaker."""
+    session = Mock()
+    session.get.return_value = _response(503)
+    response = resilient_get(
+        session, "https://flaky.example.com", retries=3, backoff_factor=0.0
+    )
+    assert response.status_code == 503
+    assert session.get.call_count == 4
+    breaker = resilience.breaker_for("https://flaky.example.com")
+    assert breaker._failures == 4
+
+    session.get.return_value = _response(200)
+    resilient_get(session, "https://flaky.example.com", retries=3, backoff_factor=0.0)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_timeouts_with_budget_left_count_against_host() -> None:
+    """A deadline shorter than the timeout does not shield a hanging host."""
+    session = Mock()
+    session.get.side_effect = requests.ReadTimeout("read timed out")
+    for _ in range(5):
+        with pytest.raises(requests.ReadTimeout) as excinfo:
+            resilient_get(session, "https://hangs.example.com", timeout=30, deadline=Deadline(25))
+        assert not isinstance(excinfo.value, DeadlineExceeded)
+    assert resilience.breaker_for("https://hangs.example.com").state == CircuitBreaker.OPEN
@@ -0,0 +1,125 @@
+"""Unit tests for in-flight request coalescing."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from res_match_crawler import http_helper
+from res_match_crawler.resilience import Deadline, DeadlineExceeded
+from res_match_crawler.singleflight import SingleFlight, default_group, request_key
+
+
+def test_request_key_normalizes_equivalent_urls() -> None:
+    """Host case, default port, fragment and parameter order do not matter."""
+    a = request_key("HTTPS://Example.com:443/jobs?b=2#top", {"a": "1"})
+    b = request_key("https://example.com/jobs", {"b": 2, "a": "1"})
+    assert a == b
+    assert request_key("https://example.com/jobs", namespace="json") != b
+    assert request_key("https://example.com/jobs", options={"timeout": 10}) != b
+
+
+def test_get_html_coalesces_concurrent_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Eight concurrent identical fetches hit the network once."""
+    network_calls = 0
+    release = threading.Event()
+
+    def mock_session_get(url, **kwargs):
+        nonlocal network_calls
+        network_calls += 1
+        release.wait(timeout=5)
+        response = Mock()
+        response.status_code = 200
+        response.raise_for_status.return_value = None
+        response.text = "<html>ok</html>"
+        return response
+
+    monkeypatch.setattr(http_helper._SESSION, "get", mock_session_get)
+    default_group().reset_stats()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [
+            pool.submit(http_helper.get_html, "https://example.com/feed", params={"q": "py"})
+            for _ in range(8)
+        ]
+        # Let every caller join the in-flight request before it completes
+        while default_group().stats().calls < 8:
+            time.sleep(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == ["<html>ok</html>"] * 8
+    assert network_calls == 1
+    stats = default_group().stats()
+    assert (stats.executions, stats.saved) == (1, 7)
+
+
+def test_errors_are_shared_and_not_cached() -> None:
+    """Followers see the leader's exception; the next call runs again."""
+    group = SingleFlight()
+
+    def fail() -> int:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        group.do("k", fail)
+    assert group.do("k", lambda: 42) == 42
+    assert group.stats().executions == 2
+
+
+def test_follower_retries_after_leaders_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A caller with time to spare does not inherit another caller's deadline."""
+    release = threading.Event()
+    timeouts = []
+
+    def mock_session_get(url, *, timeout, **kwargs):
+        timeouts.append(timeout)
+        if timeout < 1:  # The leader's request, clamped to its 0.3s budget
+            release.wait(timeout=5)
+            time.sleep(timeout)  # A real read timeout fires after the full timeout
+            raise requests.ReadTimeout("read timed out")
+        response = Mock()
+        response.status_code = 200
+        response.raise_for_status.return_value = None
+        response.text = "<html>ok</html>"
+        return response
+
+    monkeypatch.setattr(http_helper._SESSION, "get", mock_session_get)
+    default_group().reset_stats()
+    url = "https://deadline.example.com/job"
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(http_helper.get_html, url, deadline=Deadline(0.3))
+        while not timeouts:
+            time.sleep(0.01)
+        follower = pool.submit(http_helper.get_html, url)
+        while default_group().stats().calls < 2:
+            time.sleep(0.01)
+        release.set()
+
+        with pytest.raises(DeadlineExceeded):
+            leader.result()
+        assert follower.result() == "<html>ok</html>"
+    assert timeouts[-1] == 10
+
+
+def test_follower_waits_only_within_own_timeout() -> None:
+    """A follower gives up when its own wait budget runs out."""
+    group = SingleFlight()
+    release = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(group.do, "k", lambda: release.wait(timeout=5))
+        while "k" not in group._calls:
+            time.sleep(0.01)
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            group.do("k", lambda: None, timeout=0.1)
+        assert time.monotonic() - start < 1
+        release.set()
+        assert leader.result() is True
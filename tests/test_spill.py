@@ -0,0 +1,109 @@
+"""Unit tests for the spill-to-disk result buffer."""
+
+from __future__ import annotations
+
+import datetime as dt
+import io
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from res_match_crawler import cli
+from res_match_crawler.cli import _write_json
+from res_match_crawler.spill import SpillBuffer, parse_size
+
+from .factories import make_posting
+
+
+BODY = "x" * 500  # Large enough for small budgets to spill often
+
+
+def test_parse_size() -> None:
+    assert parse_size("512") == 512
+    assert parse_size("256M") == 256 * 1024 * 1024
+    assert parse_size("1.5GiB") == 1536 * 1024 * 1024
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_spills_and_merges_with_dedup(tmp_path) -> None:
+    """Duplicates across spilled segments collapse to the first-seen posting."""
+    with SpillBuffer(memory_budget=4096, spill_dir=str(tmp_path)) as buffer:
+        buffer.extend(
+            make_posting(n, "first", BODY, posted_at=dt.date(2024, 5, n % 28 + 1)) for n in range(40)
+        )
+        buffer.extend(make_posting(n, "second", BODY) for n in range(20, 60))
+        assert buffer.spilled
+        assert buffer.buffered_bytes <= 4096
+
+        merged = list(buffer)
+        assert [p.url for p in merged] == [f"https://example.com/{n}" for n in range(60)]
+        assert {p.title for p in merged[:40]} == {"first"}
+        assert merged[5].posted_at == dt.date(2024, 5, 6)
+
+    assert os.listdir(tmp_path) == []  # Segments are removed on close
+
+
+def test_bounded_fan_in_keeps_insertion_order(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Many segments merge in passes; output order matches the unspilled case."""
+    open_files = 0
+    peak = 0
+    read_file = SpillBuffer._read_file
+
+    def counting_read_file(path):
+        nonlocal open_files, peak
+        open_files += 1
+        peak = max(peak, open_files)
+        try:
+            yield from read_file(path)
+        finally:
+            open_files -= 1
+
+    monkeypatch.setattr(SpillBuffer, "_read_file", staticmethod(counting_read_file))
+    order = list(range(99, -1, -1))  # Insertion order differs from URL order
+    with SpillBuffer(memory_budget=2048, spill_dir=str(tmp_path), max_fan_in=3) as buffer:
+        buffer.extend(make_posting(n, description=BODY) for n in order)
+        buffer.extend(make_posting(n, description=BODY) for n in range(0, 100, 7))  # Duplicates
+        assert len(buffer._segments) > 9
+
+        urls = [p.url for p in buffer]
+        assert urls == [f"https://example.com/{n}" for n in order]
+        assert peak <= 3
+        assert list(buffer) == [make_posting(n, description=BODY) for n in order]  # Iterable more than once
+
+
+def test_unbounded_buffer_keeps_insertion_order() -> None:
+    buffer = SpillBuffer()
+    buffer.extend([make_posting(3), make_posting(1), make_posting(3)])
+    assert [p.url for p in buffer] == ["https://example.com/3", "https://example.com/1"]
+    assert buffer.added == 3 and not buffer.spilled
+
+
+def test_streamed_json_matches_json_dumps() -> None:
+    jobs = [make_posting(1, description=BODY), make_posting(2, posted_at=dt.date(2024, 5, 2))]
+    expected = json.dumps([j.to_dict() for j in jobs], ensure_ascii=False, indent=2)
+    for items, reference in ((jobs, expected), ([], "[]")):
+        out = io.StringIO()
+        _write_json(items, out)
+        assert out.getvalue() == reference + "\n"
+
+
+def test_cli_deadline_is_shared_by_all_keywords(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    """Each keyword gets what is left of one run-wide budget."""
+    budgets = []
+
+    def fake_search(self, keyword, location="", *, limit=20, deadline=None):
+        budgets.append(deadline)
+        time.sleep(0.15)
+        return [make_posting(len(budgets), keyword)]
+
+    monkeypatch.setattr(cli.IndeedScraper, "search", fake_search)
+    monkeypatch.setattr(sys, "argv", ["cli", "python", "golang", "rust", "--deadline", "0.25", "--json"])
+    cli.main()
+
+    assert len(budgets) == 2  # The budget ran out before "rust"
+    assert budgets[0] <= 0.25 and budgets[1] < 0.1
+    assert [job["title"] for job in json.loads(capsys.readouterr().out)] == ["python", "golang"]